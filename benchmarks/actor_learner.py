@@ -0,0 +1,64 @@
+"""
+Entrenamiento actor-learner (-actors N): transiciones por segundo,
+profundidad de la cola, antigüedad de la política y ocupación del
+learner según el número de actores y el tamaño de lote, frente al
+entrenamiento en serie con el mismo número total de episodios.
+
+Uso: python3 -m benchmarks.actor_learner [-episodes 400] [-actors 1 2 4]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+
+from benchmarks.hogwild import calidad, serial
+from src.actor_learner import train_actor_learner
+from src.agent import Agent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark actor-learner")
+    parser.add_argument("-episodes", type=int, default=400)
+    parser.add_argument("-actors", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("-batch-size", type=int, nargs="+", default=[256])
+    parser.add_argument("-test", type=int, default=20)
+    parser.add_argument("-seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()} | episodios: {args.episodes}")
+    print(
+        f"{'modo':>14} | {'trans/s':>9} | {'cola':>9} | {'antigüedad':>10} "
+        f"| {'learner':>7} | {'manzanas':>8}"
+    )
+    agent, stats, elapsed = serial(args.episodes, args.seed)
+    apples, _ = calidad(agent, args.test, args.seed)
+    pasos = sum(s[1] for s in stats)
+    print(
+        f"{'serie':>14} | {pasos / elapsed:9,.0f} | {'-':>9} | {'-':>10} | "
+        f"{'-':>7} | {apples:8.1f}"
+    )
+    for num_actors in args.actors:
+        for batch_size in args.batch_size:
+            agent = Agent(q_backend="dense")
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, m = train_actor_learner(
+                    agent,
+                    num_actors,
+                    num_episodes=args.episodes,
+                    batch_size=batch_size,
+                    seed=args.seed,
+                    verbose=False,
+                )
+            apples, _ = calidad(agent, args.test, args.seed)
+            print(
+                f"{f'{num_actors}x{batch_size}':>14} | "
+                f"{m['transiciones_s']:9,.0f} | "
+                f"{m['cola_media']:4.1f}/{m['cola_max']:<4} | "
+                f"{m['antiguedad_media']:5.1f}/{m['antiguedad_max']:<4} | "
+                f"{m['ocupacion_learner']:7.0%} | {apples:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Pasos/segundo de Board.move_snake + Interpreter.get_compressed_state
+según el tamaño del tablero.
+
+La serpiente juega al azar evitando los peligros inmediatos, como el
+agente cuando explora. El coste por paso no debe crecer con el área.
+
+Uso: python3 -m benchmarks.board_size [-steps 20000] [-sizes 10 50 200]
+                                      [-backend grid|bitboard]
+"""
+
+import argparse
+import random
+import time
+
+from src.environment import Board
+from src.bitboard import BitBoard
+from src.interpreter import Interpreter
+
+BACKENDS = {"grid": Board, "bitboard": BitBoard}
+
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+
+def bench_size(size, num_steps, board_cls=Board):
+    board = board_cls(width=size, height=size)
+    interpreter = Interpreter(board)
+    estado = interpreter.get_compressed_state()
+    move_time = 0.0
+    state_time = 0.0
+
+    for _ in range(num_steps):
+        seguras = [a for a, c in zip(ACTIONS, estado) if c != "DANGER_IMM"]
+        accion = random.choice(seguras or ACTIONS)
+
+        t0 = time.perf_counter()
+        _, game_over = board.move_snake(accion)
+        t1 = time.perf_counter()
+        if game_over:
+            board.reset()
+        t2 = time.perf_counter()
+        estado = interpreter.get_compressed_state()
+        t3 = time.perf_counter()
+
+        move_time += t1 - t0
+        state_time += t3 - t2
+
+    return num_steps / move_time, num_steps / state_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark board size")
+    parser.add_argument("-steps", type=int, default=20000)
+    parser.add_argument("-sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("-backend", default="grid", choices=sorted(BACKENDS))
+    args = parser.parse_args()
+
+    print(f"{'size':>9} | {'move_snake/s':>13} | {'vision/s':>13}")
+    for size in args.sizes:
+        random.seed(0)
+        moves, states = bench_size(size, args.steps, BACKENDS[args.backend])
+        print(f"{size:>4}x{size:<4} | {moves:13,.0f} | {states:13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
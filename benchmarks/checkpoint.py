@@ -0,0 +1,87 @@
+"""
+Coste de los checkpoints para el bucle de entrenamiento: main.train sin
+checkpoints, con Checkpointer (en segundo plano) y con un save_model
+síncrono cada N episodios, con el mismo número de episodios.
+
+Uso: python3 -m benchmarks.checkpoint [-episodes 300] [-every 1 10]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from main import save_model, train
+from src.agent import Agent
+from src.checkpoint import Checkpointer
+from src.environment import Board
+from src.interpreter import Interpreter
+
+
+class SaveModel:
+    """save_model síncrono con la interfaz de Checkpointer"""
+
+    def __init__(self, directory, every, filename="model.txt"):
+        self.every = every
+        self.path = os.path.join(directory, filename)
+
+    def maybe_save(self, agent, episode):
+        if episode % self.every == 0:
+            self.save(agent, episode)
+
+    def save(self, agent, episode):
+        save_model(agent, self.path)
+
+    def wait(self):
+        pass
+
+
+def entrenar(q_backend, num_episodes, checkpointer, seed=0):
+    random.seed(seed)
+    board = Board(seed=seed)
+    agent = Agent(q_backend=q_backend)
+    interpreter = Interpreter(board, encoded=agent.encoded)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        train(
+            agent,
+            board,
+            interpreter,
+            None,
+            num_episodes=num_episodes,
+            verbose=False,
+            checkpointer=checkpointer,
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark checkpoints")
+    parser.add_argument("-episodes", type=int, default=300)
+    parser.add_argument("-every", type=int, nargs="+", default=[1, 10])
+    args = parser.parse_args()
+
+    print(f"{'q-table':>7} | {'modo':>16} | {'segundos':>8}")
+    for q_backend in ("dict", "dense"):
+        base = entrenar(q_backend, args.episodes, None)
+        print(f"{q_backend:>7} | {'sin checkpoints':>16} | {base:8.2f}")
+        for every in args.every:
+            for nombre, clase in (
+                ("Checkpointer", Checkpointer),
+                ("save_model", SaveModel),
+            ):
+                with tempfile.TemporaryDirectory() as tmp:
+                    segundos = entrenar(
+                        q_backend, args.episodes, clase(tmp, every)
+                    )
+                print(
+                    f"{q_backend:>7} | {f'{nombre} /{every}':>16} | "
+                    f"{segundos:8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
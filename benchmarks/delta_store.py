@@ -0,0 +1,73 @@
+"""
+Guardar el modelo después de cada episodio: save_model completo en JSON
+y en binario frente al store base + log (.qlog), que solo escribe lo que
+cambió. Muestra el tiempo medio por guardado y los bytes escritos.
+
+Uso: python3 -m benchmarks.delta_store [-episodes 300] [-qtable dense]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from main import save_model
+from src.agent import Agent
+from src.delta_store import DeltaStore
+from src.environment import Board
+from src.interpreter import Interpreter
+from src.training import run_episode
+
+
+def escritos(path):
+    """Bytes del archivo o, si es un store, de todos sus archivos"""
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(path, name))
+            for name in os.listdir(path)
+        )
+    return os.path.getsize(path)
+
+
+def medir(q_backend, num_episodes, path, seed=0):
+    """(segundos medios por guardado, bytes escritos en total)"""
+    random.seed(seed)
+    board = Board(seed=seed)
+    agent = Agent(q_backend=q_backend)
+    interpreter = Interpreter(board, encoded=agent.encoded)
+    store = DeltaStore(path) if path.endswith(".qlog") else None
+    total = 0.0
+    bytes_escritos = 0
+    for _ in range(num_episodes):
+        run_episode(agent, board, interpreter)
+        antes = escritos(path) if store else 0
+        start = time.perf_counter()
+        save_model(agent, path, store)
+        total += time.perf_counter() - start
+        # El store crece (log) o se compacta (base nueva)
+        despues = escritos(path)
+        bytes_escritos += despues - antes if despues > antes else despues
+    return total / num_episodes, bytes_escritos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark .qlog")
+    parser.add_argument("-episodes", type=int, default=300)
+    parser.add_argument("-qtable", default="dict", choices=("dict", "dense"))
+    args = parser.parse_args()
+
+    print(f"{'formato':>8} | {'ms/guardado':>11} | {'KB escritos':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for formato in (".txt", ".bin", ".qlog"):
+            segundos, total = medir(
+                args.qtable, args.episodes, os.path.join(tmp, "m" + formato)
+            )
+            print(
+                f"{formato:>8} | {segundos * 1e3:11.3f} | "
+                f"{total / 1024:11,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
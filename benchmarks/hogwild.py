@@ -0,0 +1,86 @@
+"""
+Entrenamiento Hogwild (-qtable shared -workers N): transiciones por
+segundo según el número de procesos, y calidad de la política final con
+main.test frente al entrenamiento en serie con el mismo número total de
+episodios.
+
+Uso: python3 -m benchmarks.hogwild [-episodes 200] [-workers 1 2 4]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+
+from main import test
+from src.agent import Agent
+from src.environment import Board
+from src.interpreter import Interpreter
+from src.training import run_episode, train_hogwild
+
+
+def serial(num_episodes, seed):
+    random.seed(seed)
+    board = Board(seed=seed)
+    interpreter = Interpreter(board, encoded=True)
+    agent = Agent(q_backend="dense")
+    start = time.perf_counter()
+    stats = [
+        run_episode(agent, board, interpreter) for _ in range(num_episodes)
+    ]
+    return agent, stats, time.perf_counter() - start
+
+
+def hogwild(num_episodes, num_workers, seed):
+    agent = Agent(q_backend="shared")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = train_hogwild(
+            agent, num_workers, num_episodes=num_episodes, seed=seed
+        )
+    return agent, stats, time.perf_counter() - start
+
+
+def calidad(agent, num_episodes, seed):
+    """(manzanas medias, mejor longitud) de main.test"""
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, _, apples, best = test(agent, num_episodes, verbose=False)
+    return apples, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Hogwild")
+    parser.add_argument("-episodes", type=int, default=200)
+    parser.add_argument("-workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("-test", type=int, default=20)
+    parser.add_argument("-seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()} | episodios: {args.episodes}")
+    print(
+        f"{'modo':>10} | {'trans/s':>9} | {'segundos':>8} | "
+        f"{'test manzanas':>13} | {'test mejor':>10}"
+    )
+    modos = [("serie", lambda: serial(args.episodes, args.seed))]
+    for n in args.workers:
+        modos.append(
+            (
+                f"{n} workers",
+                lambda n=n: hogwild(args.episodes, n, args.seed),
+            )
+        )
+    for nombre, entrenar in modos:
+        agent, stats, elapsed = entrenar()
+        pasos = sum(s[1] for s in stats)
+        apples, best = calidad(agent, args.test, args.seed)
+        print(
+            f"{nombre:>10} | {pasos / elapsed:9,.0f} | {elapsed:8.2f} | "
+            f"{apples:13.1f} | {best:10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Arranque (crear el Agent y cargar el modelo) y selecciones por segundo
+explotando con un modelo binario cargado (dict, dense) o mapeado en
+memoria (-qtable mmap), para modelos de distintos tamaños.
+
+Uso: python3 -m benchmarks.mmap_model [-pairs 1000 10000 26244]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from main import load_model
+from src.agent import Agent
+from src.encoding import NUM_STATES
+from src.model_file import NUM_ACTIONS, write_binary
+
+PARAMS = {"epsilon": 0.0, "alpha": 0.35, "gamma": 0.95}
+
+
+def crear_modelo(path, num_pairs, seed=0):
+    rng = np.random.default_rng(seed)
+    celdas = rng.choice(NUM_STATES * NUM_ACTIONS, num_pairs, replace=False)
+    write_binary(path, celdas, rng.normal(size=num_pairs), PARAMS)
+
+
+def arrancar(q_backend, path):
+    """(agent, segundos hasta tenerlo listo)"""
+    start = time.perf_counter()
+    agent = Agent(encoded=True, q_backend=q_backend, model_path=path)
+    if q_backend != "mmap":
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_model(agent, path)
+    return agent, time.perf_counter() - start
+
+
+def selecciones(agent, estados):
+    agent.epsilon = 0.0
+    seleccionar = agent.seleccionar_accion
+    start = time.perf_counter()
+    for estado in estados:
+        seleccionar(estado)
+    return len(estados) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark -qtable mmap")
+    parser.add_argument(
+        "-pairs", type=int, nargs="+", default=[1000, 10000, 26244]
+    )
+    parser.add_argument("-steps", type=int, default=50000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    estados = [random.randrange(NUM_STATES) for _ in range(args.steps)]
+    print(
+        f"{'pares':>6} | {'backend':>7} | {'arranque ms':>11} | "
+        f"{'selecciones/s':>13}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_pairs in args.pairs:
+            path = os.path.join(tmp, f"{num_pairs}.bin")
+            crear_modelo(path, num_pairs)
+            for q_backend in ("dict", "dense", "mmap"):
+                agent, segundos = arrancar(q_backend, path)
+                rate = selecciones(agent, estados)
+                print(
+                    f"{num_pairs:6} | {q_backend:>7} | "
+                    f"{segundos * 1e3:11.2f} | {rate:13,.0f}"
+                )
+                del agent
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Tiempo de entrenamiento con -workers N frente al entrenamiento en un solo
+proceso, con el mismo número total de episodios. Muestra también las
+manzanas verdes y la mejor longitud para comparar la calidad.
+
+El speedup está limitado por los núcleos de la máquina (os.cpu_count()).
+
+Uso: python3 -m benchmarks.parallel_train [-episodes 200] [-workers 1 2 4 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+
+from src.agent import Agent
+from src.environment import Board
+from src.interpreter import Interpreter
+from src.training import run_episode, train_parallel
+
+
+def serial(num_episodes, seed):
+    random.seed(seed)
+    board = Board(seed=seed)
+    interpreter = Interpreter(board)
+    agent = Agent()
+    start = time.perf_counter()
+    stats = [
+        run_episode(agent, board, interpreter) for _ in range(num_episodes)
+    ]
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(s[0] for s in stats), max(s[2] for s in stats)
+
+
+def parallel(num_episodes, num_workers, sync_every, seed):
+    agent = Agent()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = train_parallel(
+            agent,
+            num_workers,
+            num_episodes=num_episodes,
+            sync_every=sync_every,
+            seed=seed,
+            verbose=False,
+        )
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(s[0] for s in stats), max(s[2] for s in stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark -workers")
+    parser.add_argument("-episodes", type=int, default=200)
+    parser.add_argument("-workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("-sync-every", type=int, default=10)
+    parser.add_argument("-seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()} | episodios: {args.episodes}")
+    print(
+        f"{'modo':>10} | {'segundos':>8} | {'speedup':>7} | "
+        f"{'manzanas':>8} | {'mejor':>5}"
+    )
+    base, apples, best = serial(args.episodes, args.seed)
+    print(f"{'serie':>10} | {base:8.2f} | {1.0:7.2f} | {apples:8} | {best:5}")
+    for num_workers in args.workers:
+        elapsed, apples, best = parallel(
+            args.episodes, num_workers, args.sync_every, args.seed
+        )
+        print(
+            f"{f'{num_workers} workers':>10} | {elapsed:8.2f} | "
+            f"{base / elapsed:7.2f} | {apples:8} | {best:5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
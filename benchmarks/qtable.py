@@ -0,0 +1,70 @@
+"""
+Coste por paso de la Q-table dict frente a la densa (DenseQTable):
+update_q_value y mejor_accion_segura sobre transiciones de partidas
+reales, ya codificadas.
+
+Uso: python3 -m benchmarks.qtable [-steps 50000]
+"""
+
+import argparse
+import random
+import time
+
+from src.agent import Agent
+from src.environment import Board
+from src.interpreter import Interpreter
+
+
+def collect(num_steps, seed=0):
+    """Transiciones (estado, accion, recompensa, siguiente, seguras)"""
+    board = Board(seed=seed)
+    interpreter = Interpreter(board, encoded=True)
+    agent = Agent(encoded=True)
+    rng = random.Random(seed)
+    transitions = []
+    estado = interpreter.get_compressed_state()
+    for _ in range(num_steps):
+        seguras = agent._get_acciones_seguras(estado) or [0, 1, 2, 3]
+        accion = rng.choice(seguras)
+        recompensa, game_over = board.move_snake(accion)
+        siguiente = None if game_over else interpreter.get_compressed_state()
+        transitions.append((estado, accion, recompensa, siguiente, seguras))
+        if game_over:
+            board.reset()
+            siguiente = interpreter.get_compressed_state()
+        estado = siguiente
+    return transitions
+
+
+def bench(agent, transitions, repeats=5):
+    """Mejor tiempo (ns por paso) de update y de mejor acción"""
+    best_update = best_select = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for estado, accion, recompensa, siguiente, _ in transitions:
+            agent.update_q_value(estado, accion, recompensa, siguiente)
+        middle = time.perf_counter()
+        for estado, _, _, _, seguras in transitions:
+            agent.mejor_accion_segura(estado, seguras)
+        end = time.perf_counter()
+        best_update = min(best_update, middle - start)
+        best_select = min(best_select, end - middle)
+    n = len(transitions)
+    return best_update / n * 1e9, best_select / n * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Q-table")
+    parser.add_argument("-steps", type=int, default=50000)
+    args = parser.parse_args()
+
+    transitions = collect(args.steps)
+    print(f"{'backend':>8} | {'update ns':>10} | {'mejor acción ns':>15}")
+    for q_backend in ("dict", "dense"):
+        agent = Agent(encoded=True, q_backend=q_backend)
+        update, select = bench(agent, transitions)
+        print(f"{q_backend:>8} | {update:10.0f} | {select:15.0f}")
+
+
+if __name__ == "__main__":
+    main()
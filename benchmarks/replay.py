@@ -0,0 +1,67 @@
+"""
+Coste de añadir y muestrear en ReplayMemory frente a la lista anterior
+(append + pop(0) al llenarse, y ordenar todo el buffer en cada replay).
+
+Uso: python3 -m benchmarks.replay [-capacities 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from src.replay import ReplayMemory
+
+
+def bench_list(capacity, num_adds, num_samples):
+    buffer = []
+    start = time.perf_counter()
+    for i in range(num_adds):
+        buffer.append((i, 0, 10, i + 1))
+        if len(buffer) > capacity:
+            buffer.pop(0)
+    middle = time.perf_counter()
+    for _ in range(num_samples):
+        ordenado = sorted(buffer, key=lambda x: x[2], reverse=True)
+        ordenado[0]
+    end = time.perf_counter()
+    return (middle - start) / num_adds, (end - middle) / num_samples
+
+
+def bench_memory(capacity, num_adds, num_samples, batch=32):
+    memory = ReplayMemory(capacity, rng=random.Random(0))
+    start = time.perf_counter()
+    for i in range(num_adds):
+        memory.add((i, 0, 10, i + 1))
+    middle = time.perf_counter()
+    for _ in range(num_samples):
+        indices, _ = memory.sample(batch)
+        memory.update_priorities(indices, [1.0] * batch)
+    end = time.perf_counter()
+    return (middle - start) / num_adds, (end - middle) / num_samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark replay memory")
+    parser.add_argument(
+        "-capacities", type=int, nargs="+", default=[100000, 1000000]
+    )
+    parser.add_argument("-samples", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'capacidad':>10} | {'memoria':>8} | {'add us':>8} | "
+        f"{'replay us':>10}"
+    )
+    for capacity in args.capacities:
+        # Llenar el buffer y añadir otro 10% para que tenga que reciclar
+        num_adds = capacity + capacity // 10
+        for name, bench in (("lista", bench_list), ("ring", bench_memory)):
+            add, replay = bench(capacity, num_adds, args.samples)
+            print(
+                f"{capacity:>10} | {name:>8} | {add * 1e6:8.3f} | "
+                f"{replay * 1e6:10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Selecciones por segundo de Agent.seleccionar_accion, explorando
+(epsilon=1) y explotando (epsilon=0), con estados de partidas reales y
+una Q-table ya entrenada con ellos.
+
+Uso: python3 -m benchmarks.seleccion [-steps 50000]
+"""
+
+import argparse
+import random
+import time
+
+from src.agent import Agent
+from src.encoding import decode_state
+from benchmarks.qtable import collect
+
+CONFIGS = (
+    ("dict", False),
+    ("dict", True),
+    ("dense", True),
+)
+
+
+def bench(agent, estados, epsilon, repeats=5):
+    """Mejor tasa (selecciones/s) de varias repeticiones"""
+    agent.epsilon = epsilon
+    seleccionar = agent.seleccionar_accion
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for estado in estados:
+            seleccionar(estado)
+        best = min(best, time.perf_counter() - start)
+    return len(estados) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark seleccion")
+    parser.add_argument("-steps", type=int, default=50000)
+    args = parser.parse_args()
+
+    transitions = collect(args.steps)
+    print(
+        f"{'backend':>8} | {'estado':>7} | {'explora/s':>11} | "
+        f"{'explota/s':>11}"
+    )
+    for q_backend, encoded in CONFIGS:
+        random.seed(0)
+        agent = Agent(encoded=encoded, q_backend=q_backend)
+        estados = []
+        for estado, accion, recompensa, siguiente, _ in transitions:
+            if not encoded:
+                estado = decode_state(estado)
+                accion = agent.acciones[accion]
+                if siguiente is not None:
+                    siguiente = decode_state(siguiente)
+            agent.update_q_value(estado, accion, recompensa, siguiente)
+            estados.append(estado)
+
+        explora = bench(agent, estados, 1.0)
+        explota = bench(agent, estados, 0.0)
+        nombre = "int" if encoded else "tupla"
+        print(
+            f"{q_backend:>8} | {nombre:>7} | {explora:11,.0f} | "
+            f"{explota:11,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Tiempo por paso de Board.move_snake según la longitud de la serpiente.
+
+La serpiente recorre un ciclo hamiltoniano del tablero (sin manzanas),
+así nunca choca y cada paso avanza cabeza y cola.
+
+Uso: python3 -m benchmarks.snake_length [-size 40] [-lengths 3 40 400]
+"""
+
+import argparse
+import time
+
+from src.environment import Board
+
+MOVES = {(0, -1): "UP", (0, 1): "DOWN", (-1, 0): "LEFT", (1, 0): "RIGHT"}
+
+
+def hamiltonian_cycle(width, height):
+    """Ciclo que recorre todas las celdas (height debe ser par)"""
+    cycle = [(0, y) for y in range(height - 1, -1, -1)]
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cycle.extend((x, y) for x in xs)
+    return cycle
+
+
+def place_snake(board, cells):
+    """Sustituye la serpiente del tablero por cells (cabeza primero)"""
+    for x, y in board.segments:
+        board.board[y][x] = 0
+        board.free.add(y * board.width + x)
+        board.row_count[y] -= 1
+        board.col_count[x] -= 1
+    board.segments.clear()
+    for x, y in cells:
+        board.segments.append((x, y))
+        board.board[y][x] = 1
+        board.free.remove(y * board.width + x)
+        board.row_count[y] += 1
+        board.col_count[x] += 1
+    board.len = len(cells)
+
+
+def bench_length(size, length, num_steps, repeats=5):
+    """Mejor tiempo por paso (ns) de varias repeticiones"""
+    return min(_time_length(size, length, num_steps) for _ in range(repeats))
+
+
+def _time_length(size, length, num_steps):
+    board = Board(width=size, height=size, green_apples=0, red_apples=0)
+    cycle = hamiltonian_cycle(size, size)
+    n = len(cycle)
+    place_snake(board, [cycle[i] for i in range(length - 1, -1, -1)])
+
+    acciones = []
+    for i in range(n):
+        (x0, y0), (x1, y1) = cycle[i], cycle[(i + 1) % n]
+        acciones.append(MOVES[(x1 - x0, y1 - y0)])
+
+    head = length - 1
+    start = time.perf_counter()
+    for step in range(num_steps):
+        _, game_over = board.move_snake(acciones[(head + step) % n])
+    elapsed = time.perf_counter() - start
+    assert not game_over
+    return elapsed / num_steps * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snake length")
+    parser.add_argument("-size", type=int, default=40)
+    parser.add_argument("-steps", type=int, default=50000)
+    parser.add_argument("-lengths", type=int, nargs="+", default=[3, 40, 400])
+    args = parser.parse_args()
+
+    print(f"Tablero {args.size}x{args.size}")
+    for length in args.lengths:
+        ns = bench_length(args.size, length, args.steps)
+        print(f"length {length:>5}: {ns:8.0f} ns/step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Coste de snapshot()/restore()/clone() frente a copy.deepcopy, y rollouts
+especulativos por segundo desde un mismo estado.
+
+Uso: python3 -m benchmarks.snapshot [-size 10] [-rollouts 2000] [-depth 10]
+"""
+
+import argparse
+import copy
+import random
+import time
+
+from src.environment import Board
+from src.bitboard import BitBoard
+
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+
+def time_us(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def rollouts_per_sec(board, num_rollouts, depth):
+    """Juega num_rollouts partidas cortas desde el estado actual"""
+    snap = board.snapshot()
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(num_rollouts):
+        board.restore(snap)
+        for _ in range(depth):
+            _, game_over = board.move_snake(rng.choice(ACTIONS))
+            if game_over:
+                break
+    board.restore(snap)
+    return num_rollouts / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot")
+    parser.add_argument("-size", type=int, default=10)
+    parser.add_argument("-rollouts", type=int, default=2000)
+    parser.add_argument("-depth", type=int, default=10)
+    args = parser.parse_args()
+
+    for cls in (Board, BitBoard):
+        board = cls(width=args.size, height=args.size, seed=0)
+        snap = board.snapshot()
+        print(f"{cls.__name__} {args.size}x{args.size}")
+        print(f"  snapshot:  {time_us(board.snapshot, 5000):8.2f} us")
+        print(
+            f"  restore:   {time_us(lambda: board.restore(snap), 5000):8.2f}"
+            " us"
+        )
+        print(f"  clone:     {time_us(board.clone, 5000):8.2f} us")
+        print(
+            f"  deepcopy:  {time_us(lambda: copy.deepcopy(board), 500):8.2f}"
+            " us"
+        )
+        rate = rollouts_per_sec(board, args.rollouts, args.depth)
+        print(f"  rollouts (depth {args.depth}): {rate:10,.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
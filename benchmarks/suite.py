@@ -0,0 +1,284 @@
+"""
+Suite de rendimiento de los caminos calientes, con semillas fijas:
+
+- move_snake y reset del tablero
+- get_compressed_state del intérprete
+- seleccionar_accion y update_q_value del agente
+- un episodio completo de entrenamiento (run_episode, sin display)
+
+Cada caso se mide en tramos (un episodio o un bloque de llamadas) y da
+las operaciones por segundo en la mediana y en los percentiles 10 y 90
+de los tramos. Con -json guarda el resultado; con -baseline lo compara
+con uno guardado y termina con código 1 si la mediana de algún caso cae
+más de -threshold (fracción) respecto a la del baseline.
+
+Uso:
+    python3 -m benchmarks.suite -json bench.json
+    python3 -m benchmarks.suite -baseline bench.json [-threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+from src.agent import Agent, Q_BACKENDS
+from src.interpreter import Interpreter
+from src.training import BACKENDS, run_episode
+
+PERCENTILES = (10, 50, 90)
+
+
+def jugar(args, num_steps):
+    """
+    Episodios de una política aleatoria entre acciones seguras: lista de
+    (acciones, estados, transiciones) por episodio, para repetirlos en
+    un tablero nuevo con la misma semilla.
+    """
+    random.seed(args.seed)
+    board = BACKENDS[args.backend](seed=args.seed)
+    agent = Agent(encoded=args.encoded, q_backend=args.qtable)
+    interpreter = Interpreter(board, encoded=agent.encoded)
+    episodios = []
+    pasos = 0
+    while pasos < num_steps:
+        board.reset()
+        estado = interpreter.get_compressed_state()
+        acciones, estados, transiciones = [], [], []
+        game_over = False
+        while not game_over and len(acciones) <= 1000:
+            accion = random.choice(agent._validas[estado])
+            recompensa, game_over = board.move_snake(accion)
+            siguiente = (
+                None if game_over else interpreter.get_compressed_state()
+            )
+            acciones.append(accion)
+            estados.append(estado)
+            transiciones.append((estado, accion, recompensa, siguiente))
+            estado = siguiente
+        episodios.append((acciones, estados, transiciones))
+        pasos += len(acciones)
+    return episodios
+
+
+def _overhead():
+    """ns que cuesta medir con perf_counter_ns (mediana)"""
+    clock = time.perf_counter_ns
+    muestras = []
+    for _ in range(1000):
+        t0 = clock()
+        muestras.append(clock() - t0)
+    return float(np.median(muestras))
+
+
+def bench_move_snake(args, episodios):
+    board = BACKENDS[args.backend](seed=args.seed)
+    clock = time.perf_counter_ns
+    tramos = []
+    for acciones, _, _ in episodios:
+        board.reset()
+        move = board.move_snake
+        t0 = clock()
+        for accion in acciones:
+            move(accion)
+        tramos.append((len(acciones), clock() - t0))
+    return tramos
+
+
+def bench_reset(args, episodios, bloque=100):
+    board = BACKENDS[args.backend](seed=args.seed)
+    clock = time.perf_counter_ns
+    reset = board.reset
+    tramos = []
+    for _ in range(len(episodios)):
+        t0 = clock()
+        for _ in range(bloque):
+            reset()
+        tramos.append((bloque, clock() - t0))
+    return tramos
+
+
+def bench_get_compressed_state(args, episodios):
+    """Una medida por llamada (descontando lo que cuesta medir)"""
+    board = BACKENDS[args.backend](seed=args.seed)
+    interpreter = Interpreter(board, encoded=args.encoded)
+    clock = time.perf_counter_ns
+    overhead = _overhead()
+    tramos = []
+    for acciones, _, _ in episodios:
+        board.reset()
+        move = board.move_snake
+        get_state = interpreter.get_compressed_state
+        total = 0
+        for accion in acciones:
+            t0 = clock()
+            get_state()
+            total += clock() - t0 - overhead
+            move(accion)
+        tramos.append((len(acciones), max(total, 1)))
+    return tramos
+
+
+def _agente(args, episodios):
+    """Agent con la Q-table ya entrenada con las transiciones"""
+    agent = Agent(encoded=args.encoded, q_backend=args.qtable)
+    for _, _, transiciones in episodios:
+        for transicion in transiciones:
+            agent._bellman(*transicion)
+    return agent
+
+
+def bench_seleccionar_accion(args, episodios):
+    agent = _agente(args, episodios)
+    agent.epsilon = 0.1
+    seleccionar = agent.seleccionar_accion
+    clock = time.perf_counter_ns
+    tramos = []
+    for _, estados, _ in episodios:
+        t0 = clock()
+        for estado in estados:
+            seleccionar(estado)
+        tramos.append((len(estados), clock() - t0))
+    return tramos
+
+
+def bench_update_q_value(args, episodios):
+    agent = Agent(encoded=args.encoded, q_backend=args.qtable)
+    update = agent.update_q_value
+    clock = time.perf_counter_ns
+    tramos = []
+    for _, _, transiciones in episodios:
+        t0 = clock()
+        for transicion in transiciones:
+            update(*transicion)
+        tramos.append((len(transiciones), clock() - t0))
+    return tramos
+
+
+def bench_episode(args, episodios):
+    """Episodios de entrenamiento completos: pasos por segundo"""
+    board = BACKENDS[args.backend](seed=args.seed)
+    agent = Agent(encoded=args.encoded, q_backend=args.qtable)
+    interpreter = Interpreter(board, encoded=agent.encoded)
+    clock = time.perf_counter_ns
+    tramos = []
+    for _ in range(len(episodios)):
+        t0 = clock()
+        _, steps, _ = run_episode(agent, board, interpreter)
+        tramos.append((steps, clock() - t0))
+    return tramos
+
+
+CASES = {
+    "move_snake": bench_move_snake,
+    "reset": bench_reset,
+    "get_compressed_state": bench_get_compressed_state,
+    "seleccionar_accion": bench_seleccionar_accion,
+    "update_q_value": bench_update_q_value,
+    "episode": bench_episode,
+}
+
+
+def resumen(tramos):
+    """Operaciones y operaciones/s (total y percentiles de los tramos)"""
+    ops = sum(n for n, _ in tramos)
+    ns = sum(t for _, t in tramos)
+    rates = [n / t * 1e9 for n, t in tramos if n]
+    resultado = {"ops": ops, "rate": ops / ns * 1e9}
+    for p, valor in zip(PERCENTILES, np.percentile(rates, PERCENTILES)):
+        resultado[f"p{p}"] = float(valor)
+    return resultado
+
+
+def comparar(resultados, baseline, threshold):
+    """Imprime la comparación; devuelve los casos con regresión"""
+    regresiones = []
+    print(f"\n{'caso':>22} | {'baseline p50':>12} | {'p50':>12} | cambio")
+    for caso, actual in resultados.items():
+        base = baseline["results"].get(caso)
+        if base is None:
+            continue
+        cambio = actual["p50"] / base["p50"] - 1
+        marca = ""
+        if cambio < -threshold:
+            regresiones.append(caso)
+            marca = "  REGRESIÓN"
+        print(
+            f"{caso:>22} | {base['p50']:12,.0f} | {actual['p50']:12,.0f} | "
+            f"{cambio:+6.1%}{marca}"
+        )
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de rendimiento")
+    parser.add_argument("-steps", type=int, default=20000)
+    parser.add_argument("-seed", type=int, default=0)
+    parser.add_argument("-backend", default="grid", choices=sorted(BACKENDS))
+    parser.add_argument("-qtable", default="dict", choices=Q_BACKENDS[:2])
+    parser.add_argument("-encoded", action="store_true")
+    parser.add_argument(
+        "-cases", nargs="+", default=list(CASES), choices=list(CASES)
+    )
+    parser.add_argument("-json", help="Guardar el resultado en JSON")
+    parser.add_argument("-baseline", help="JSON con el que comparar")
+    parser.add_argument(
+        "-threshold",
+        type=float,
+        default=0.2,
+        help="Caída máxima de la mediana frente al baseline (default: 0.2)",
+    )
+    args = parser.parse_args()
+    # La Q-table densa usa estados codificados
+    args.encoded = args.encoded or args.qtable == "dense"
+
+    episodios = jugar(args, args.steps)
+    resultados = {}
+    print(
+        f"{'caso':>22} | {'ops':>7} | {'p10/s':>12} | {'p50/s':>12} | "
+        f"{'p90/s':>12}"
+    )
+    for caso in args.cases:
+        random.seed(args.seed)
+        resultados[caso] = r = resumen(CASES[caso](args, episodios))
+        print(
+            f"{caso:>22} | {r['ops']:7} | {r['p10']:12,.0f} | "
+            f"{r['p50']:12,.0f} | {r['p90']:12,.0f}"
+        )
+
+    salida = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": {
+                k: v
+                for k, v in vars(args).items()
+                if k not in ("json", "baseline", "threshold")
+            },
+        },
+        "results": resultados,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(salida, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("args") != salida["meta"]["args"]:
+            print("Aviso: el baseline se midió con otros argumentos")
+        regresiones = comparar(resultados, baseline, args.threshold)
+        if regresiones:
+            print(f"\nRegresiones: {', '.join(regresiones)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
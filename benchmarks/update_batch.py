@@ -0,0 +1,79 @@
+"""
+Transiciones/segundo de Agent.update_batch frente a update_q_value una a
+una, con las Q-tables dict y densa. Comprueba además que los dos backends
+dan la misma Q-table tras los lotes.
+
+Termina con código 1 si las Q-tables no coinciden.
+
+Uso: python3 -m benchmarks.update_batch [-steps 50000] [-batch 256 4096]
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.qtable import collect
+from src.agent import Agent
+
+
+def per_transition(q_backend, transitions):
+    agent = Agent(encoded=True, q_backend=q_backend)
+    start = time.perf_counter()
+    for estado, accion, recompensa, siguiente, _ in transitions:
+        agent.update_q_value(estado, accion, recompensa, siguiente)
+    return len(transitions) / (time.perf_counter() - start)
+
+
+def batched(q_backend, batches):
+    agent = Agent(encoded=True, q_backend=q_backend)
+    start = time.perf_counter()
+    for batch in batches:
+        agent.update_batch(*batch)
+    elapsed = time.perf_counter() - start
+    return agent, sum(len(b[0]) for b in batches) / elapsed
+
+
+def make_batches(transitions, batch_size):
+    batches = []
+    for i in range(0, len(transitions), batch_size):
+        end = i + batch_size
+        chunk = transitions[i:end]
+        estados, acciones, recompensas, siguientes, _ = zip(*chunk)
+        dones = [s is None for s in siguientes]
+        batches.append((estados, acciones, recompensas, siguientes, dones))
+    return batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark update_batch")
+    parser.add_argument("-steps", type=int, default=50000)
+    parser.add_argument("-batch", type=int, nargs="+", default=[256, 4096])
+    args = parser.parse_args()
+
+    transitions = collect(args.steps)
+    print(f"{'backend':>8} | {'lote':>6} | {'transiciones/s':>14}")
+    for q_backend in ("dict", "dense"):
+        rate = per_transition(q_backend, transitions)
+        print(f"{q_backend:>8} | {'1':>6} | {rate:14,.0f}")
+
+    mismatches = 0
+    for batch_size in args.batch:
+        batches = make_batches(transitions, batch_size)
+        agents = {}
+        for q_backend in ("dict", "dense"):
+            agents[q_backend], rate = batched(q_backend, batches)
+            print(f"{q_backend:>8} | {batch_size:>6} | {rate:14,.0f}")
+
+        dense = agents["dense"].q_table
+        for key, value in agents["dict"].q_table.items():
+            if abs(dense.get(key, 0) - value) > 1e-3:
+                mismatches += 1
+        if len(dense) != len(agents["dict"].q_table):
+            mismatches += 1
+
+    print(f"fallos {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
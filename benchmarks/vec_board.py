@@ -0,0 +1,68 @@
+"""
+Compara pasos/segundo de Board (una partida) contra VecBoard (N partidas).
+
+Ambos juegan una política aleatoria que nunca da media vuelta, para que
+la carga se parezca a un entrenamiento y no solo a reinicios.
+
+Uso: python3 -m benchmarks.vec_board [-envs 256] [-steps 2000]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.environment import Board
+from src.vec_environment import VecBoard, ACTIONS
+
+# Acción opuesta a cada acción (UP<->DOWN, LEFT<->RIGHT)
+REVERSE = (1, 0, 3, 2)
+
+
+def bench_board(num_steps):
+    board = Board()
+    last = 0
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        action = random.randrange(4)
+        if action == REVERSE[last]:
+            action = last
+        last = action
+        _, game_over = board.move_snake(ACTIONS[action])
+        if game_over:
+            board.reset()
+    return num_steps / (time.perf_counter() - start)
+
+
+def bench_vec_board(num_envs, num_steps):
+    vec = VecBoard(num_envs=num_envs, seed=0)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 4, size=(num_steps, num_envs))
+    reverse = np.array(REVERSE)
+    last = np.zeros(num_envs, dtype=np.int64)
+    start = time.perf_counter()
+    for t in range(num_steps):
+        action = actions[t]
+        action = np.where(action == reverse[last], last, action)
+        vec.step(action)
+        last = action
+    return num_envs * num_steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VecBoard")
+    parser.add_argument("-envs", type=int, default=256)
+    parser.add_argument("-steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    single = bench_board(args.steps * 10)
+    vec = bench_vec_board(args.envs, args.steps)
+    print(f"Board:            {single:12,.0f} steps/s")
+    print(f"VecBoard (N={args.envs}): {vec:12,.0f} steps/s")
+    print(f"Speedup:          {vec / single:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
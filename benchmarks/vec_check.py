@@ -0,0 +1,119 @@
+"""
+Comprueba que VecBoard.step da las mismas recompensas y game over que
+Board.move_snake: en cada paso copia el estado de cada partida de
+VecBoard a un Board, aplica la misma acción a los dos y compara la
+recompensa, el game over y la serpiente resultante (cabeza, segmentos y
+longitud; las manzanas nuevas salen de generadores distintos).
+
+Termina con código 1 si alguna transición no coincide.
+
+Uso: python3 -m benchmarks.vec_check [-envs 64] [-steps 3000]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from src.environment import Board
+from src.vec_environment import EMPTY, GREEN, RED, VecBoard
+
+SIZES = ((10, 10), (4, 17), (23, 7), (4, 4))
+# Acción opuesta a cada acción (UP<->DOWN, LEFT<->RIGHT)
+REVERSE = np.array([1, 0, 3, 2])
+
+
+def serpiente(vec, i):
+    """Celdas del cuerpo de la partida i, cabeza primero"""
+    ptr = vec.head_ptr[i] - np.arange(vec.segments[i])
+    return vec.body[i, ptr % vec.num_cells].tolist()
+
+
+def a_board(vec, i, board):
+    """Pone en board el estado de la partida i de vec (con restore)"""
+    width = vec.width
+    grid = vec.boards[i]
+    libres = np.flatnonzero(vec.grid[i] == EMPTY).tolist()
+    pos = [-1] * vec.num_cells
+    for k, cell in enumerate(libres):
+        pos[cell] = k
+    ocupadas = grid != EMPTY
+
+    def xy(cell):
+        return cell % width, cell // width
+
+    board.restore(
+        (
+            grid.tolist(),
+            tuple(xy(cell) for cell in serpiente(vec, i)),
+            int(vec.lengths[i]),
+            "UP",
+            False,
+            tuple(xy(c) for c in np.flatnonzero(vec.grid[i] == GREEN)),
+            tuple(xy(c) for c in np.flatnonzero(vec.grid[i] == RED)),
+            libres,
+            pos,
+            ocupadas.sum(axis=1).tolist(),
+            ocupadas.sum(axis=0).tolist(),
+            board.rng.getstate(),
+        )
+    )
+
+
+def check(width, height, num_envs, num_steps, seed):
+    """Devuelve (transiciones comprobadas, fallos)"""
+    vec = VecBoard(num_envs=num_envs, width=width, height=height, seed=seed)
+    board = Board(width=width, height=height, seed=seed)
+    rng = np.random.default_rng(seed)
+    last = np.zeros(num_envs, dtype=np.int64)
+    failures = 0
+
+    for _ in range(num_steps):
+        # Aleatoria sin media vuelta, para que haya partidas largas
+        actions = rng.integers(0, 4, size=num_envs)
+        actions = np.where(actions == REVERSE[last], last, actions)
+        esperado = []
+        for i in range(num_envs):
+            a_board(vec, i, board)
+            reward, game_over = board.move_snake(int(actions[i]))
+            cuerpo = [y * width + x for x, y in board.segments]
+            esperado.append((reward, game_over, cuerpo, board.len))
+
+        # Las partidas terminadas se reinician dentro de step
+        rewards, dones = vec.step(actions)
+        for i, (reward, game_over, cuerpo, length) in enumerate(esperado):
+            ok = rewards[i] == reward and dones[i] == game_over
+            if ok and not game_over:
+                ok = serpiente(vec, i) == cuerpo and vec.lengths[i] == length
+            if not ok:
+                failures += 1
+                print(
+                    f"  MISMATCH {width}x{height} partida {i}: "
+                    f"({rewards[i]}, {dones[i]}) != ({reward}, {game_over})"
+                )
+        last = actions
+    return num_envs * num_steps, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VecBoard vs Board")
+    parser.add_argument("-envs", type=int, default=64)
+    parser.add_argument("-steps", type=int, default=3000)
+    args = parser.parse_args()
+
+    total_failures = 0
+    for width, height in SIZES:
+        checked, failures = check(
+            width, height, args.envs, args.steps, seed=width * height
+        )
+        total_failures += failures
+        print(
+            f"{width:>3}x{height:<3} | transiciones {checked:9,} | "
+            f"fallos {failures}"
+        )
+
+    sys.exit(1 if total_failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Comprueba que get_compressed_state (rayos sobre el tablero) devuelve lo
+mismo que get_compressed_state_from_text (dibujo de get_state) en tableros
+aleatorios de varios tamaños, y compara el tiempo de ambos caminos.
+
+Termina con código 1 si algún estado no coincide.
+
+Uso: python3 -m benchmarks.vision [-steps 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from src.environment import Board
+from src.bitboard import BitBoard
+from src.interpreter import Interpreter
+
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+SIZES = ((10, 10), (4, 17), (23, 7), (40, 40))
+
+
+def check(board_cls, width, height, num_steps, seed):
+    """Devuelve (fallos, segundos camino rápido, segundos camino texto)"""
+    board = board_cls(width=width, height=height, seed=seed)
+    interpreter = Interpreter(board)
+    rng = random.Random(seed)
+    failures = 0
+    fast_time = 0.0
+    text_time = 0.0
+
+    for _ in range(num_steps):
+        t0 = time.perf_counter()
+        fast = interpreter.get_compressed_state()
+        t1 = time.perf_counter()
+        text = interpreter.get_compressed_state_from_text()
+        t2 = time.perf_counter()
+        fast_time += t1 - t0
+        text_time += t2 - t1
+        if fast != text:
+            failures += 1
+            print(f"  MISMATCH {fast} != {text}")
+            print(interpreter.get_state())
+
+        seguras = [a for a, c in zip(ACTIONS, fast) if c != "DANGER_IMM"]
+        _, game_over = board.move_snake(rng.choice(seguras or ACTIONS))
+        if game_over:
+            board.reset()
+
+    return failures, fast_time, text_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision check/benchmark")
+    parser.add_argument("-steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    total_failures = 0
+    for board_cls in (Board, BitBoard):
+        for width, height in SIZES:
+            failures, fast, text = check(
+                board_cls, width, height, args.steps, seed=width * height
+            )
+            total_failures += failures
+            print(
+                f"{board_cls.__name__:>8} {width:>3}x{height:<3} | "
+                f"rayos {args.steps / fast:10,.0f}/s | "
+                f"texto {args.steps / text:10,.0f}/s | "
+                f"fallos {failures}"
+            )
+
+    sys.exit(1 if total_failures else 0)
+
+
+if __name__ == "__main__":
+    main()
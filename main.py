@@ -1,9 +1,41 @@
 import argparse
-import json
-from src.environment import Board
+import cProfile
+import pstats
+import random
+import time
 from src.interpreter import Interpreter
-from src.agent import Agent
+from src.agent import Agent, Q_BACKENDS
+from src.actor_learner import train_actor_learner
+from src.checkpoint import Checkpointer, latest_checkpoint
+from src.delta_store import STORE_SUFFIX, DeltaStore, is_store
 from src.display import Display
+from src.evaluation import SUMMARY as EVAL_SUMMARY
+from src.evaluation import evaluate
+from src.metrics import MetricsSink
+from src.profiler import (
+    AGENT_PHASES,
+    BOARD_PHASES,
+    DISPLAY_PHASES,
+    INTERPRETER_PHASES,
+    Profiler,
+    fase,
+)
+from src.training import (
+    BACKENDS,
+    MERGES,
+    run_episode,
+    test_episode,
+    train_hogwild,
+    train_parallel,
+)
+from src.model_file import (
+    is_binary,
+    load_cells,
+    q_cells,
+    read_model,
+    write_binary,
+    write_json,
+)
 
 
 def train(
@@ -15,6 +47,11 @@ def train(
     verbose=True,
     show_visual=False,
     save_path=None,
+    checkpointer=None,
+    start_episode=0,
+    save_every=0,
+    profiler=None,
+    metrics=None,
 ):
     """
     Loop principal de entrenamiento.
@@ -28,80 +65,86 @@ def train(
         verbose: si imprime info de cada episodio
         show_visual: si muestra la interfaz gráfica
         save_path: ruta donde guardar el modelo
+        save_every: guardar también cada N episodios (con un store .qlog
+            solo se escriben los cambios)
+        checkpointer: Checkpointer para guardar checkpoints durante el
+            entrenamiento (y uno al final)
+        start_episode: episodios ya jugados (al continuar un checkpoint)
+        profiler: Profiler que mide el tiempo de cada fase del bucle
+        metrics: MetricsSink que registra cada episodio; sin él solo se
+            usan sus medias móviles para la consola (cada log_every s)
     """
+    if metrics is None:
+        metrics = MetricsSink()
     if show_visual and display.enabled:
         display.init_window()
 
     total_green_apples = 0
     best_length = 0
-
-    for episode in range(num_episodes):
-        board.reset()
-        estado = interpreter.get_compressed_state()
-        game_over = False
-        steps = 0
-        max_length = 0
-        green_apples_eaten = 0
-
-        while not game_over:
-            # Mostrar estado visual
-            if show_visual and display.enabled:
-                display.draw_board(board, episode + 1, steps)
-
-            # Agent elige acción
-            accion = agent.seleccionar_accion(estado)
-
-            # Environment ejecuta acción
-            recompensa, game_over = board.move_snake(accion)
-
-            # Contar manzanas verdes
-            if recompensa == 10:
-                green_apples_eaten += 1
-
-            # Obtener siguiente estado
-            if game_over:
-                siguiente_estado = None
-            else:
-                siguiente_estado = interpreter.get_compressed_state()
-
-            # Agent aprende
-            agent.update_q_value(estado, accion, recompensa, siguiente_estado)
-
-            # Actualizar estado para siguiente iteración
-            estado = (
-                siguiente_estado
-                if siguiente_estado is not None
-                else interpreter.get_compressed_state()
+    store = None
+    if save_path and save_path.endswith(STORE_SUFFIX):
+        store = DeltaStore(save_path)
+
+    # Con profiler, run_episode usa envoltorios que miden cada método
+    jugadores = (agent, board, interpreter)
+    display_episode = display if show_visual and display.enabled else None
+    if profiler is not None:
+        jugadores = (
+            profiler.instrument(agent, AGENT_PHASES),
+            profiler.instrument(board, BOARD_PHASES),
+            profiler.instrument(interpreter, INTERPRETER_PHASES),
+        )
+        if display_episode is not None:
+            display_episode = profiler.instrument(display, DISPLAY_PHASES)
+
+    for episode in range(start_episode, num_episodes):
+        start = time.perf_counter()
+        with fase(profiler, "episode"):
+            green_apples_eaten, steps, max_length = run_episode(
+                *jugadores, display=display_episode, episode=episode
             )
-
-            steps += 1
-            max_length = max(max_length, board.get_length())
-
-            # Límite de pasos por episodio
-            if steps > 1000:
-                game_over = True
+        wall = time.perf_counter() - start
 
         total_green_apples += green_apples_eaten
         best_length = max(best_length, max_length)
+        metrics.record(
+            "train",
+            episode + 1,
+            board.get_length(),
+            max_length,
+            green_apples_eaten,
+            steps,
+            agent.epsilon,
+            len(agent.q_table),
+            wall,
+        )
 
-        # Replay de experiencias exitosas
-        if hasattr(agent, "replay_experiences"):
-            agent.replay_experiences(num_replays=10)
-
-        # Reducir epsilon después de cada episodio
-        agent.decay_epsilon()
-
-        if verbose and (episode + 1) % max(1, num_episodes // 10) == 0:
+        # Consola limitada por tiempo, con las medias móviles
+        if verbose and (metrics.due() or episode + 1 == num_episodes):
+            medias = metrics.averages()
             print(
                 f"Episode {episode + 1}/{num_episodes} | "
-                f"Length: {board.get_length()} | "
-                f"Max Length: {max_length} | "
-                f"Green apples: {green_apples_eaten} | "
-                f"Steps: {steps} | "
+                f"Length: {medias['length']:.1f} | "
+                f"Max Length: {medias['max_length']:.1f} | "
+                f"Green apples: {medias['green_apples']:.1f} | "
+                f"Steps: {medias['steps']:.0f} | "
+                f"Steps/s: {medias['steps_s']:,.0f} | "
                 f"Epsilon: {agent.epsilon:.3f} | "
                 f"Q-table size: {len(agent.q_table)}"
             )
 
+        if checkpointer is not None:
+            with fase(profiler, "checkpoint"):
+                checkpointer.maybe_save(agent, episode + 1)
+        if save_path and save_every and (episode + 1) % save_every == 0:
+            with fase(profiler, "save"):
+                save_model(agent, save_path, store)
+
+    if checkpointer is not None:
+        if num_episodes % checkpointer.every:
+            checkpointer.save(agent, num_episodes)
+        checkpointer.wait()
+
     print("\nEntrenamiento completado. Q-table final: ")
     print(f"{len(agent.q_table)} estados")
     print(f"Total green apples eaten: {total_green_apples}/{num_episodes}")
@@ -109,7 +152,7 @@ def train(
 
     # Guardar modelo si se especifica
     if save_path:
-        save_model(agent, save_path)
+        save_model(agent, save_path, store)
         print(f"Save learning state in {save_path}")
 
     if show_visual and display.enabled:
@@ -118,13 +161,28 @@ def train(
     return agent
 
 
-def test(agent, num_episodes=3, verbose=True, show_visual=False, delay_ms=200):
+def test(
+    agent,
+    num_episodes=3,
+    verbose=True,
+    show_visual=False,
+    delay_ms=200,
+    width=10,
+    height=10,
+    green_apples=2,
+    red_apples=1,
+    backend="grid",
+    metrics=None,
+):
     """
-    Prueba el agente entrenado sin aprender (solo explotación).
+    Prueba el agente entrenado sin aprender (solo explotación). Con
+    metrics (MetricsSink), registra cada episodio.
+    Devuelve (longitud media, pasos medios, manzanas medias, mejor
+    longitud).
     """
-    board = Board()
-    interpreter = Interpreter(board)
-    display = Display(delay_ms=delay_ms)
+    board = BACKENDS[backend](width, height, green_apples, red_apples)
+    interpreter = Interpreter(board, encoded=agent.encoded)
+    display = Display(width=width, height=height, delay_ms=delay_ms)
 
     if show_visual:
         display.init_window()
@@ -138,38 +196,31 @@ def test(agent, num_episodes=3, verbose=True, show_visual=False, delay_ms=200):
     max_length_achieved = 0
 
     for episode in range(num_episodes):
-        board.reset()
-        estado = interpreter.get_compressed_state()
-        game_over = False
-        steps = 0
-        green_apples = 0
-        max_length_episode = 3
-
-        while not game_over:
-            if show_visual:
-                display.draw_board(board, episode + 1, steps)
-
-            accion = agent.seleccionar_accion(estado)
-            recompensa, game_over = board.move_snake(accion)
-
-            if recompensa == 10:
-                green_apples += 1
-
-            if not game_over:
-                estado = interpreter.get_compressed_state()
-
-            steps += 1
-            current_length = board.get_length()
-            max_length_episode = max(max_length_episode, current_length)
-
-            if steps > 5000:
-                game_over = True
+        start = time.perf_counter()
+        length, max_length_episode, green_apples, steps = test_episode(
+            agent,
+            board,
+            interpreter,
+            display=display if show_visual else None,
+            episode=episode,
+        )
 
-        length = board.get_length()
         total_length += length
         total_steps += steps
         total_green_apples += green_apples
         max_length_achieved = max(max_length_achieved, max_length_episode)
+        if metrics is not None:
+            metrics.record(
+                "test",
+                episode + 1,
+                length,
+                max_length_episode,
+                green_apples,
+                steps,
+                agent.epsilon,
+                len(agent.q_table),
+                time.perf_counter() - start,
+            )
 
         if verbose:
             print(
@@ -197,35 +248,44 @@ def test(agent, num_episodes=3, verbose=True, show_visual=False, delay_ms=200):
     if show_visual:
         display.close()
 
+    return avg_length, avg_steps, avg_apples, max_length_achieved
+
 
-def save_model(agent, filepath):
-    """Guarda el modelo (Q-table) en un archivo"""
-    model_data = {
-        "q_table": {str(k): v for k, v in agent.q_table.items()},
+def save_model(agent, filepath, store=None):
+    """
+    Guarda el modelo (Q-table) en un archivo: binario si la ruta acaba en
+    .bin, JSON legible si no (src/model_file.py). Si acaba en .qlog, es
+    un store base + log de cambios (src/delta_store.py) y solo se
+    escribe lo que cambió; store es el DeltaStore ya abierto de esa ruta
+    (si no, se abre, y abrirlo lee el store entero).
+    """
+    if filepath.endswith(STORE_SUFFIX):
+        (store or DeltaStore(filepath)).save(agent)
+        return
+    celdas, valores = q_cells(agent.q_table, agent.encoded)
+    params = {
         "epsilon": agent.epsilon,
         "alpha": agent.alpha,
         "gamma": agent.gamma,
     }
-
-    with open(filepath, "w") as f:
-        json.dump(model_data, f, indent=2)
+    if filepath.endswith(".bin"):
+        write_binary(filepath, celdas, valores, params)
+    else:
+        write_json(filepath, celdas, valores, params)
 
 
 def load_model(agent, filepath):
-    """Carga el modelo (Q-table) desde un archivo"""
-    with open(filepath, "r") as f:
-        model_data = json.load(f)
+    """Carga el modelo (Q-table) desde un archivo JSON o binario o un store"""
+    if is_store(filepath):
+        celdas, valores, params = DeltaStore(filepath).load()
+    else:
+        celdas, valores, params = read_model(filepath)
 
-    # Reconstruir Q-table (las keys son tuplas)
-    agent.q_table = {}
-    for key_str, value in model_data["q_table"].items():
-        # Convertir string de vuelta a tupla
-        key = eval(key_str)
-        agent.q_table[key] = value
+    load_cells(agent.q_table, celdas, valores, agent.encoded)
 
-    agent.epsilon = model_data.get("epsilon", agent.epsilon)
-    agent.alpha = model_data.get("alpha", agent.alpha)
-    agent.gamma = model_data.get("gamma", agent.gamma)
+    agent.epsilon = params.get("epsilon", agent.epsilon)
+    agent.alpha = params.get("alpha", agent.alpha)
+    agent.gamma = params.get("gamma", agent.gamma)
 
     print(f"Load trained model from {filepath}")
     print(f"Q-table size: {len(agent.q_table)} estados")
@@ -246,6 +306,13 @@ def main():
         default=None,
         help="Guardar modelo en ruta especificada",
     )
+    parser.add_argument(
+        "-save-every",
+        type=int,
+        default=0,
+        help="Guardar también cada N episodios; con -save modelo.qlog "
+        "solo se añaden los cambios (default: 0, solo al final)",
+    )
     parser.add_argument(
         "-load",
         type=str,
@@ -283,49 +350,413 @@ def main():
         help="Velocidad de visualización en ms \
             (default: 200, más bajo = más rápido)",
     )
+    parser.add_argument(
+        "-width",
+        type=int,
+        default=10,
+        help="Ancho del tablero (default: 10)",
+    )
+    parser.add_argument(
+        "-height",
+        type=int,
+        default=10,
+        help="Alto del tablero (default: 10)",
+    )
+    parser.add_argument(
+        "-green",
+        type=int,
+        default=2,
+        help="Número de manzanas verdes (default: 2)",
+    )
+    parser.add_argument(
+        "-red",
+        type=int,
+        default=1,
+        help="Número de manzanas rojas (default: 1)",
+    )
+    parser.add_argument(
+        "-backend",
+        type=str,
+        default="grid",
+        choices=sorted(BACKENDS),
+        help="Implementación del tablero (default: grid)",
+    )
+    parser.add_argument(
+        "-encoded",
+        action="store_true",
+        help="Estados y acciones como enteros en la Q-table",
+    )
+    parser.add_argument(
+        "-qtable",
+        type=str,
+        default="dict",
+        choices=Q_BACKENDS,
+        help="Implementación de la Q-table; dense, shared y mmap implican "
+        "-encoded. Con -workers, shared entrena sin sincronizar sobre una "
+        "Q-table en memoria compartida. mmap consulta el modelo binario de "
+        "-load sin cargarlo, con -dontlearn (default: dict)",
+    )
+
+    parser.add_argument(
+        "-replay-capacity",
+        type=int,
+        default=100,
+        help="Capacidad del replay buffer (default: 100)",
+    )
+    parser.add_argument(
+        "-replay-all",
+        action="store_true",
+        help="Guardar todas las transiciones en el replay buffer, no solo "
+        "las de recompensa >= 10",
+    )
+
+    parser.add_argument(
+        "-workers",
+        type=int,
+        default=0,
+        help="Entrenar con N procesos en paralelo (default: 0, un solo "
+        "proceso)",
+    )
+    parser.add_argument(
+        "-sync-every",
+        type=int,
+        default=10,
+        help="Episodios por worker entre sincronizaciones (default: 10)",
+    )
+    parser.add_argument(
+        "-merge",
+        type=str,
+        default="visits",
+        choices=MERGES,
+        help="Cómo combinar las Q-tables de los workers: media ponderada "
+        "por visitas o media simple (default: visits)",
+    )
+    parser.add_argument(
+        "-actors",
+        type=int,
+        default=0,
+        help="Entrenar con N procesos actores que envían sus transiciones "
+        "a un único learner; necesita -qtable dense (default: 0)",
+    )
+    parser.add_argument(
+        "-batch-size",
+        type=int,
+        default=256,
+        help="Transiciones por lote de cada actor (default: 256)",
+    )
+    parser.add_argument(
+        "-refresh-every",
+        type=int,
+        default=5,
+        help="Episodios de cada actor entre copias de la política "
+        "(default: 5)",
+    )
+    parser.add_argument(
+        "-checkpoint-every",
+        type=int,
+        default=0,
+        help="Guardar un checkpoint cada N episodios en segundo plano "
+        "(default: 0, ninguno)",
+    )
+    parser.add_argument(
+        "-checkpoint-dir",
+        type=str,
+        default="checkpoints",
+        help="Directorio de los checkpoints (default: checkpoints)",
+    )
+    parser.add_argument(
+        "-checkpoint-keep",
+        type=int,
+        default=3,
+        help="Checkpoints que se conservan (default: 3)",
+    )
+    parser.add_argument(
+        "-resume",
+        action="store_true",
+        help="Continuar desde el último checkpoint de -checkpoint-dir "
+        "hasta completar -sessions episodios",
+    )
+    parser.add_argument(
+        "-eval-workers",
+        type=int,
+        default=0,
+        help="Con -dontlearn, repartir los episodios de prueba entre N "
+        "procesos y mostrar estadísticas (default: 0, main.test)",
+    )
+    parser.add_argument(
+        "-eval-batch",
+        type=int,
+        default=50,
+        help="Episodios por bloque de -eval-workers (default: 50)",
+    )
+    parser.add_argument(
+        "-eval-tol",
+        type=float,
+        default=0.0,
+        help="Parar cuando el IC 95%% de la media de -eval-metric sea más "
+        "estrecho que tol * media (default: 0, jugar todo)",
+    )
+    parser.add_argument(
+        "-eval-metric",
+        type=str,
+        default="length",
+        choices=EVAL_SUMMARY,
+        help="Métrica de la parada temprana (default: length)",
+    )
+    parser.add_argument(
+        "-metrics",
+        type=str,
+        default=None,
+        help="Guardar las métricas de cada episodio en JSONL (o CSV si "
+        "acaba en .csv)",
+    )
+    parser.add_argument(
+        "-log-every",
+        type=float,
+        default=2.0,
+        help="Segundos entre líneas de progreso del entrenamiento, con "
+        "medias de los últimos 100 episodios (default: 2)",
+    )
+    parser.add_argument(
+        "-profile",
+        action="store_true",
+        help="Medir el tiempo de cada fase del bucle de entrenamiento y "
+        "mostrarlo al final",
+    )
+    parser.add_argument(
+        "-profile-json",
+        type=str,
+        default=None,
+        help="Guardar también la tabla de -profile en JSON (implica "
+        "-profile)",
+    )
+    parser.add_argument(
+        "-cprofile",
+        type=str,
+        default=None,
+        help="Ejecutar con cProfile y guardar las estadísticas (.pstats)",
+    )
+    parser.add_argument(
+        "-seed",
+        type=int,
+        default=None,
+        help="Semilla para que el entrenamiento sea reproducible",
+    )
 
     args = parser.parse_args()
+    if args.workers and args.visual == "on":
+        parser.error("-workers no es compatible con -visual on")
+    if args.actors:
+        if args.workers:
+            parser.error("-actors no es compatible con -workers")
+        if args.visual == "on":
+            parser.error("-actors no es compatible con -visual on")
+        if args.qtable != "dense":
+            parser.error("-actors necesita -qtable dense")
+    if args.checkpoint_every or args.resume:
+        if args.workers or args.actors or args.dontlearn:
+            parser.error(
+                "-checkpoint-every y -resume solo sirven para entrenar en "
+                "un proceso"
+            )
+        if args.resume and args.load:
+            parser.error("-resume no es compatible con -load")
+        if args.checkpoint_keep < 1:
+            parser.error("-checkpoint-keep tiene que ser >= 1")
+    if (args.profile or args.profile_json) and (
+        args.workers or args.actors or args.dontlearn
+    ):
+        parser.error("-profile solo sirve para entrenar en un proceso")
+    if args.eval_workers:
+        if not args.dontlearn:
+            parser.error("-eval-workers solo sirve con -dontlearn")
+        if args.visual == "on":
+            parser.error("-eval-workers no es compatible con -visual on")
+        if args.eval_batch < 1:
+            parser.error("-eval-batch tiene que ser >= 1")
+    if args.metrics and (args.workers or args.actors):
+        parser.error("-metrics no es compatible con -workers ni -actors")
+    if args.qtable == "mmap":
+        if not args.dontlearn:
+            parser.error("-qtable mmap solo sirve con -dontlearn")
+        if not args.load or not is_binary(args.load):
+            parser.error("-qtable mmap necesita -load con un modelo binario")
+
+    if args.cprofile:
+        perfil = cProfile.Profile()
+        try:
+            perfil.runcall(run, args)
+        finally:
+            perfil.dump_stats(args.cprofile)
+            print(f"\ncProfile guardado en {args.cprofile}")
+            pstats.Stats(perfil).sort_stats("tottime").print_stats(15)
+    else:
+        run(args)
+
 
+def run(args):
+    """Entrena o prueba según los argumentos ya validados de main"""
     # Configurar agente
-    agent = Agent()
+    agent = Agent(
+        encoded=args.encoded,
+        q_backend=args.qtable,
+        replay_capacity=args.replay_capacity,
+        replay_min_reward=None if args.replay_all else 10,
+        model_path=args.load,
+    )
 
-    # Cargar modelo si se especifica
-    if args.load:
+    # Cargar modelo si se especifica (mapeado ya está disponible)
+    if args.qtable == "mmap":
+        print(f"Map trained model from {args.load}")
+        print(f"Q-table size: {len(agent.q_table)} estados")
+    elif args.load:
         load_model(agent, args.load)
 
+    # Continuar desde el último checkpoint
+    start_episode = 0
+    if args.resume:
+        latest = latest_checkpoint(args.checkpoint_dir)
+        if latest is None:
+            print(f"No hay checkpoints en {args.checkpoint_dir}")
+        else:
+            start_episode, path = latest
+            load_model(agent, path)
+            print(f"Resume from episode {start_episode}")
+
     # Configurar visualización
     show_visual = args.visual == "on"
     verbose = args.verbose == "on"
 
     # Modo testing (sin aprender)
-    if args.dontlearn:
+    if args.dontlearn and args.eval_workers:
+        print("=== EVALUATION MODE (no learning) ===")
+        with MetricsSink(args.metrics, log_every=args.log_every) as metrics:
+            evaluate(
+                agent,
+                args.sessions,
+                args.eval_workers,
+                batch_size=args.eval_batch,
+                seed=args.seed,
+                tol=args.eval_tol,
+                metric=args.eval_metric,
+                metrics=metrics,
+                backend=args.backend,
+                width=args.width,
+                height=args.height,
+                green_apples=args.green,
+                red_apples=args.red,
+            )
+    elif args.dontlearn:
         print("=== TESTING MODE (no learning) ===")
-        test(
-            agent,
-            num_episodes=args.sessions,
-            verbose=verbose,
-            show_visual=show_visual,
-            delay_ms=args.speed,
-        )
+        with MetricsSink(args.metrics, log_every=args.log_every) as metrics:
+            test(
+                agent,
+                num_episodes=args.sessions,
+                verbose=verbose,
+                show_visual=show_visual,
+                delay_ms=args.speed,
+                width=args.width,
+                height=args.height,
+                green_apples=args.green,
+                red_apples=args.red,
+                backend=args.backend,
+                metrics=metrics,
+            )
     else:
         # Modo entrenamiento
         print("=== TRAINING MODE ===")
-        board = Board()
-        interpreter = Interpreter(board)
-        display = Display(delay_ms=args.speed)
+        if args.actors:
+            train_actor_learner(
+                agent,
+                args.actors,
+                num_episodes=args.sessions,
+                batch_size=args.batch_size,
+                refresh_every=args.refresh_every,
+                seed=args.seed,
+                verbose=verbose,
+                backend=args.backend,
+                width=args.width,
+                height=args.height,
+                green_apples=args.green,
+                red_apples=args.red,
+            )
+        elif args.workers and args.qtable == "shared":
+            train_hogwild(
+                agent,
+                args.workers,
+                num_episodes=args.sessions,
+                seed=args.seed,
+                verbose=verbose,
+                backend=args.backend,
+                width=args.width,
+                height=args.height,
+                green_apples=args.green,
+                red_apples=args.red,
+            )
+        elif args.workers:
+            train_parallel(
+                agent,
+                args.workers,
+                num_episodes=args.sessions,
+                sync_every=args.sync_every,
+                merge=args.merge,
+                seed=args.seed,
+                verbose=verbose,
+                backend=args.backend,
+                width=args.width,
+                height=args.height,
+                green_apples=args.green,
+                red_apples=args.red,
+            )
+        if args.workers or args.actors:
+            if args.save:
+                save_model(agent, args.save)
+                print(f"Save learning state in {args.save}")
+            return
+
+        if args.seed is not None:
+            random.seed(args.seed)
+        board = BACKENDS[args.backend](
+            args.width, args.height, args.green, args.red, seed=args.seed
+        )
+        interpreter = Interpreter(board, encoded=agent.encoded)
+        profiler = Profiler() if args.profile or args.profile_json else None
+        display = Display(
+            width=args.width, height=args.height, delay_ms=args.speed
+        )
         display.enabled = show_visual
         display.step_by_step = args.step_by_step
 
-        train(
-            agent,
-            board,
-            interpreter,
-            display,
-            num_episodes=args.sessions,
-            verbose=verbose,
-            show_visual=show_visual,
-            save_path=args.save,
-        )
+        with MetricsSink(args.metrics, log_every=args.log_every) as metrics:
+            train(
+                agent,
+                board,
+                interpreter,
+                display,
+                num_episodes=args.sessions,
+                verbose=verbose,
+                show_visual=show_visual,
+                save_path=args.save,
+                save_every=args.save_every,
+                checkpointer=(
+                    Checkpointer(
+                        args.checkpoint_dir,
+                        args.checkpoint_every,
+                        args.checkpoint_keep,
+                    )
+                    if args.checkpoint_every
+                    else None
+                ),
+                start_episode=start_episode,
+                profiler=profiler,
+                metrics=metrics,
+            )
+        if profiler is not None:
+            print("\n=== PROFILE (tiempo por fase) ===")
+            print(profiler.report())
+            if args.profile_json:
+                profiler.write_json(args.profile_json)
+                print(f"Profile guardado en {args.profile_json}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,294 @@
+"""
+Entrenamiento actor-learner: varios procesos actores juegan con una copia
+de solo lectura de la política y envían sus transiciones por lotes a un
+único learner (el proceso principal), que las aplica con update_batch y
+publica la Q-table nueva en memoria compartida.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+
+import numpy as np
+
+from src.qtable import SharedQTable
+from src.training import (
+    crear_worker,
+    repartir_episodios,
+    run_episode,
+    worker_config,
+)
+
+
+class Publicacion:
+    """
+    Q-table publicada por el learner en memoria compartida, con un
+    contador de versión tipo seqlock: impar mientras se copia, par cuando
+    la copia está completa. version // 2 = número de publicaciones.
+    """
+
+    def __init__(self, name=None, version=None):
+        self.tabla = SharedQTable(name)
+        if version is None:
+            version = mp.Value("q", 0, lock=False)
+        self.version = version
+
+    def publicar(self, valores):
+        self.version.value += 1
+        self.tabla.values[:] = valores
+        self.version.value += 1
+
+    def copiar(self, destino):
+        """
+        Copia la última versión completa en destino (array) y devuelve su
+        número de publicación
+        """
+        while True:
+            antes = self.version.value
+            if antes % 2:
+                continue
+            destino[:] = self.tabla.values
+            if self.version.value == antes:
+                return antes // 2
+
+
+class Lote:
+    """Transiciones de un actor pendientes de enviar, en listas"""
+
+    def __init__(self):
+        self.estados = []
+        self.acciones = []
+        self.recompensas = []
+        self.siguientes = []
+        self.dones = []
+
+    def __len__(self):
+        return len(self.estados)
+
+    def append(self, estado, accion, recompensa, siguiente_estado):
+        self.estados.append(estado)
+        self.acciones.append(accion)
+        self.recompensas.append(recompensa)
+        done = siguiente_estado is None
+        self.siguientes.append(0 if done else siguiente_estado)
+        self.dones.append(done)
+
+    def arrays(self):
+        """Los arrays compactos que viajan por la cola"""
+        return (
+            np.array(self.estados, dtype=np.int32),
+            np.array(self.acciones, dtype=np.int8),
+            np.array(self.recompensas, dtype=np.float32),
+            np.array(self.siguientes, dtype=np.int32),
+            np.array(self.dones, dtype=bool),
+        )
+
+
+def _actor(
+    cola,
+    actor_id,
+    num_episodes,
+    config,
+    shared_name,
+    version,
+    enviados,
+    batch_size,
+    refresh_every,
+):
+    """
+    Juega sus episodios con la política publicada, que vuelve a copiar
+    cada refresh_every episodios, y envía las transiciones en lotes de
+    batch_size. Cada lote lleva la publicación con la que se jugó y
+    suma 1 a enviados (la cola no sabe su tamaño en todas partes).
+    """
+    agent, board, interpreter = crear_worker(actor_id, config)
+    publicacion = Publicacion(shared_name, version)
+    lote = Lote()
+    usada = 0
+
+    def enviar():
+        with enviados.get_lock():
+            enviados.value += 1
+        cola.put(("lote", actor_id, usada, lote.arrays()))
+        lote.__init__()
+
+    def on_transition(estado, accion, recompensa, siguiente_estado):
+        lote.append(estado, accion, recompensa, siguiente_estado)
+        if len(lote) >= batch_size:
+            enviar()
+
+    stats = []
+    for episode in range(num_episodes):
+        if episode % refresh_every == 0:
+            usada = publicacion.copiar(agent.q_table.values)
+        stats.append(
+            run_episode(agent, board, interpreter, on_transition=on_transition)
+        )
+    if len(lote):
+        enviar()
+    cola.put(("fin", actor_id, stats, agent.epsilon))
+
+
+def train_actor_learner(
+    agent,
+    num_actors,
+    num_episodes=10,
+    batch_size=256,
+    refresh_every=5,
+    publish_every=1,
+    seed=None,
+    verbose=True,
+    log_every=2.0,
+    backend="grid",
+    width=10,
+    height=10,
+    green_apples=2,
+    red_apples=1,
+):
+    """
+    Entrenamiento actor-learner con num_actors procesos actores. agent
+    (Q-table densa) es el learner: aplica cada lote con update_batch y
+    publica su Q-table cada publish_every lotes.
+
+    Métricas (impresas cada log_every segundos con verbose y devueltas al
+    final): profundidad de la cola, antigüedad de la política con la que
+    se jugó cada lote (en publicaciones), transiciones por segundo y
+    fracción del tiempo que el learner pasa aprendiendo.
+
+    Devuelve (estadísticas de cada episodio, métricas).
+    """
+    if not agent.dense:
+        raise ValueError("El learner necesita una Q-table densa")
+    config = worker_config(
+        agent, seed, backend, width, height, green_apples, red_apples
+    )
+    config["q_backend"] = "dense"
+
+    publicacion = Publicacion()
+    publicacion.publicar(agent.q_table.values)
+    cola = mp.Queue()
+    # Lotes puestos en la cola: Queue.qsize no existe en macOS
+    enviados = mp.Value("q", 0)
+    actores = [
+        mp.Process(
+            target=_actor,
+            args=(
+                cola,
+                i,
+                n,
+                config,
+                publicacion.tabla.name,
+                publicacion.version,
+                enviados,
+                batch_size,
+                refresh_every,
+            ),
+        )
+        for i, n in enumerate(repartir_episodios(num_episodes, num_actors))
+    ]
+    for actor in actores:
+        actor.start()
+
+    metricas = {
+        "transiciones": 0,
+        "lotes": 0,
+        "publicaciones": 1,  # la inicial
+        "cola_media": 0.0,
+        "cola_max": 0,
+        "antiguedad_media": 0.0,
+        "antiguedad_max": 0,
+        "transiciones_s": 0.0,
+        "ocupacion_learner": 0.0,
+    }
+    resultados = []
+    cola_total = 0
+    antiguedad_total = 0
+    aprendiendo = 0.0
+    inicio = ultimo_log = ultima_revision = time.perf_counter()
+
+    def revisar():
+        # Un actor que falla (exitcode != 0) no enviará su "fin"
+        if any(actor.exitcode for actor in actores):
+            raise RuntimeError("Un actor terminó con un error")
+
+    try:
+        while len(resultados) < num_actors:
+            try:
+                msg = cola.get(timeout=1.0)
+            except queue.Empty:
+                revisar()
+                continue
+            if msg[0] == "fin":
+                resultados.append(msg[1:])
+                continue
+
+            _, _, usada, arrays = msg
+            # Lotes que siguen en la cola tras sacar este
+            profundidad = enviados.value - metricas["lotes"] - 1
+            antiguedad = publicacion.version.value // 2 - usada
+            t0 = time.perf_counter()
+            agent.update_batch(*arrays)
+            metricas["lotes"] += 1
+            if metricas["lotes"] % publish_every == 0:
+                publicacion.publicar(agent.q_table.values)
+                metricas["publicaciones"] += 1
+            aprendiendo += time.perf_counter() - t0
+
+            metricas["transiciones"] += len(arrays[0])
+            cola_total += profundidad
+            antiguedad_total += antiguedad
+            metricas["cola_max"] = max(metricas["cola_max"], profundidad)
+            metricas["antiguedad_max"] = max(
+                metricas["antiguedad_max"], antiguedad
+            )
+
+            ahora = time.perf_counter()
+            # Con la cola siempre llena no llega el Empty
+            if ahora - ultima_revision >= 1.0:
+                ultima_revision = ahora
+                revisar()
+            if verbose and ahora - ultimo_log >= log_every:
+                ultimo_log = ahora
+                ritmo = metricas["transiciones"] / (ahora - inicio)
+                print(
+                    f"Transitions: {metricas['transiciones']} | "
+                    f"Trans/s: {ritmo:,.0f}"
+                    f" | Queue: {profundidad} | Staleness: {antiguedad} | "
+                    f"Q-table size: {len(agent.q_table)}"
+                )
+    finally:
+        # Con un error del learner o de un actor, parar los que quedan
+        for actor in actores:
+            if actor.is_alive() and len(resultados) < num_actors:
+                actor.terminate()
+            actor.join()
+
+    total = time.perf_counter() - inicio
+    lotes = max(metricas["lotes"], 1)
+    metricas["cola_media"] = cola_total / lotes
+    metricas["antiguedad_media"] = antiguedad_total / lotes
+    metricas["transiciones_s"] = metricas["transiciones"] / total
+    metricas["ocupacion_learner"] = aprendiendo / total
+
+    resultados.sort()
+    # El menor epsilon: el del actor que más episodios ha jugado
+    agent.epsilon = min(epsilon for _, _, epsilon in resultados)
+    todos = [s for _, stats, _ in resultados for s in stats]
+
+    print("\nEntrenamiento completado. Q-table final: ")
+    print(f"{len(agent.q_table)} estados")
+    print(
+        f"Total green apples eaten: {sum(s[0] for s in todos)}/"
+        f"{num_episodes}"
+    )
+    print(f"Best length achieved: {max((s[2] for s in todos), default=0)}")
+    print(
+        f"Trans/s: {metricas['transiciones_s']:,.0f} | "
+        f"Queue: media {metricas['cola_media']:.1f}, "
+        f"max {metricas['cola_max']} | "
+        f"Staleness: media {metricas['antiguedad_media']:.1f}, "
+        f"max {metricas['antiguedad_max']} | "
+        f"Learner ocupado: {metricas['ocupacion_learner']:.0%}"
+    )
+
+    return todos, metricas
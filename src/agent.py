@@ -1,26 +1,88 @@
 import random
 
+import numpy as np
+
+from src.encoding import ACTIONS, action_tables
+from src.qtable import DenseQTable, MappedQTable, SharedQTable
+from src.replay import ReplayMemory
+
+# Implementaciones de la Q-table
+Q_BACKENDS = ("dict", "dense", "shared", "mmap")
+
 
 class Agent:
-    def __init__(self):
-        self.q_table = {}
+    def __init__(
+        self,
+        encoded=False,
+        q_backend="dict",
+        replay_capacity=100,
+        replay_min_reward=10,
+        shared_name=None,
+        model_path=None,
+        count_visits=False,
+    ):
+        """
+        Con encoded=True los estados son enteros (Interpreter con
+        encoded=True) y las acciones 0-3 en vez de "UP"... "RIGHT".
+
+        q_backend="dense" guarda la Q-table en un array de NumPy
+        (DenseQTable) y obliga a usar estados codificados. "shared" hace
+        lo mismo en memoria compartida entre procesos (SharedQTable): un
+        bloque nuevo, o el ya creado por otro Agent si se da shared_name.
+        "mmap" consulta sin cargarlo el modelo binario model_path
+        (MappedQTable), solo para jugar: no puede aprender.
+
+        El replay buffer guarda hasta replay_capacity transiciones con
+        recompensa >= replay_min_reward (None: todas).
+
+        Con count_visits=True la Q-table dict cuenta también las
+        actualizaciones de cada par en visitas (solo lo necesitan los
+        workers de train_parallel); las densas las cuentan siempre.
+        """
+        if q_backend not in Q_BACKENDS:
+            raise ValueError(f"Q-table desconocida: {q_backend}")
+        self.dense = q_backend in ("dense", "shared", "mmap")
+        self.encoded = encoded or self.dense
+        self.acciones = tuple(range(4)) if self.encoded else ACTIONS
+        # Acciones seguras, hacia comida y válidas de cada estado
+        self._seguras, self._comida, self._validas = action_tables(
+            self.encoded
+        )
+        if q_backend == "shared":
+            self.q_table = SharedQTable(shared_name)
+        elif q_backend == "mmap":
+            self.q_table = MappedQTable(model_path)
+        elif q_backend == "dense":
+            self.q_table = DenseQTable()
+        else:
+            self.q_table = {}
+        # Actualizaciones de cada par (estado, accion): el array de la
+        # Q-table densa o un dict con las claves de q_table que se han
+        # actualizado con count_visits (la de solo lectura no tiene)
+        self.visitas = getattr(self.q_table, "visits", {})
+        self.count_visits = count_visits
+        # Pares actualizados desde el último guardado incremental
+        # (DeltaStore.save lo activa con un set; None = no se siguen)
+        self.cambiadas = None
         self.epsilon = 1.0
         self.alpha = 0.35
         self.gamma = 0.95
-        self.replay_buffer = []
+        if q_backend == "mmap":
+            # Los parámetros guardados con el modelo
+            vars(self).update(self.q_table.params)
+        self.replay_buffer = ReplayMemory(replay_capacity)
+        self.replay_min_reward = replay_min_reward
 
     def seleccionar_accion(self, estado):
         """
         Epsilon-greedy con sesgo hacia comida cuando explora
         """
-        vld_act = self._get_acciones_seguras(estado)
-        acciones_con_comida = self._get_acciones_hacia_comida(estado)
-
-        if not vld_act:
-            vld_act = ["UP", "DOWN", "LEFT", "RIGHT"]
+        # Seguras, o las 4 si no hay ninguna
+        vld_act = self._validas[estado]
 
         if random.random() < self.epsilon:
             # Exploración: preferir comida si hay
+            acciones_con_comida = self._comida[estado]
             if acciones_con_comida and random.random() < 0.7:
                 return random.choice(acciones_con_comida)
             return random.choice(vld_act)
@@ -33,130 +95,163 @@ class Agent:
         Devuelve acciones que NO llevan a peligro inmediato.
         estado = (UP_cat, DOWN_cat, LEFT_cat, RIGHT_cat)
         """
-        acciones_seguras = []
-
-        # UP es segura si no hay peligro inmediato
-        if estado[0] != "DANGER_IMM":
-            acciones_seguras.append("UP")
-
-        # DOWN es segura si no hay peligro inmediato
-        if estado[1] != "DANGER_IMM":
-            acciones_seguras.append("DOWN")
-
-        # LEFT es segura si no hay peligro inmediato
-        if estado[2] != "DANGER_IMM":
-            acciones_seguras.append("LEFT")
-
-        # RIGHT es segura si no hay peligro inmediato
-        if estado[3] != "DANGER_IMM":
-            acciones_seguras.append("RIGHT")
-
-        return acciones_seguras
+        return self._seguras[estado]
 
     def _get_acciones_hacia_comida(self, estado):
         """
         Devuelve acciones que van hacia manzanas verdes
         """
-        acciones_comida = []
-        direcciones = ["UP", "DOWN", "LEFT", "RIGHT"]
-
-        for i, dir_name in enumerate(direcciones):
-            cat = estado[i]
-            if "FOOD" in cat:  # FOOD_CLOSE, FOOD_NEAR, FOOD_FAR
-                acciones_comida.append(dir_name)
-
-        return acciones_comida
+        return self._comida[estado]
 
     def mejor_accion(self, estado):
         """
         Devuelve la acción con mayor Q-value para ese estado.
         """
-        q_values = {
-            "UP": self.q_table.get((estado, "UP"), 0),
-            "DOWN": self.q_table.get((estado, "DOWN"), 0),
-            "LEFT": self.q_table.get((estado, "LEFT"), 0),
-            "RIGHT": self.q_table.get((estado, "RIGHT"), 0),
-        }
-
-        max_q = max(q_values.values())
-        mejores_acciones = [a for a, q in q_values.items() if q == max_q]
-        return random.choice(mejores_acciones)
+        return self.mejor_accion_segura(estado, self.acciones)
 
     def mejor_accion_segura(self, estado, vld_act):
         """
         Devuelve la mejor acción entre las válidas
         """
-        q_values = {}
+        if self.dense:
+            return self.q_table.mejor_accion(estado, vld_act)
+
+        # Máximo y número de empates en una pasada; solo si hay empate,
+        # otra pasada para elegir uno al azar
+        q_table = self.q_table
+        max_q = None
         for accion in vld_act:
-            q_values[accion] = self.q_table.get((estado, accion), 0)
+            q = q_table.get((estado, accion), 0)
+            if max_q is None or q > max_q:
+                max_q = q
+                mejor = accion
+                empates = 1
+            elif q == max_q:
+                empates += 1
 
-        max_q = max(q_values.values())
-        mejores_acciones = [a for a, q in q_values.items() if q == max_q]
-        return random.choice(mejores_acciones)
+        if empates > 1:
+            k = random.randrange(empates)
+            for accion in vld_act:
+                if q_table.get((estado, accion), 0) == max_q:
+                    if not k:
+                        return accion
+                    k -= 1
+        return mejor
 
     def update_q_value(self, estado, accion, recompensa, siguiente_estado):
         """
         Actualiza Q-table usando la ecuación de Bellman.
         """
-        if siguiente_estado is None:
-            q_target = recompensa
-        else:
-            mejor_siguiente = max(
-                self.q_table.get((siguiente_estado, a), 0)
-                for a in ["UP", "DOWN", "LEFT", "RIGHT"]
-            )
-            q_target = recompensa + self.gamma * mejor_siguiente
-
-        q_actual = self.q_table.get((estado, accion), 0)
-        self.q_table[(estado, accion)] = q_actual + self.alpha * (
-            q_target - q_actual
-        )
+        self._bellman(estado, accion, recompensa, siguiente_estado)
 
-        # Guardar experiencias exitosas
-        if recompensa >= 10:
-            self.replay_buffer.append(
+        # Guardar experiencias exitosas (o todas)
+        if (
+            self.replay_min_reward is None
+            or recompensa >= self.replay_min_reward
+        ):
+            self.replay_buffer.add(
                 (estado, accion, recompensa, siguiente_estado)
             )
-            if len(self.replay_buffer) > 100:
-                self.replay_buffer.pop(0)
 
-    def replay_experiences(self, num_replays=20):
-        """
-        Re-aprende de experiencias exitosas, priorizando las mejores
+    def update_batch(self, estados, acciones, recompensas, siguientes, dones):
         """
-        if len(self.replay_buffer) < 5:
-            return
+        Aplica un lote de transiciones con la ecuación de Bellman.
 
-        # Ordenar por recompensa (mejores primero)
-        sorted_buffer = sorted(
-            self.replay_buffer, key=lambda x: x[2], reverse=True
-        )
-
-        for i in range(num_replays):
-            # Tomar más de las mejores experiencias
-            if i < num_replays // 2:
-                idx = i % min(len(sorted_buffer) // 2, len(sorted_buffer))
-                estado, accion, recompensa, siguiente_estado = sorted_buffer[
-                    idx
-                ]
-            else:
-                estado, accion, recompensa, siguiente_estado = random.choice(
-                    self.replay_buffer
+        Los objetivos se calculan con la Q-table de antes del lote y los
+        pares (estado, accion) repetidos reciben la media de sus errores
+        TD, así que el orden del lote no importa. Los siguientes estados
+        de las transiciones con done se ignoran. No pasa por el replay
+        buffer.
+        """
+        if self.dense:
+            if self.cambiadas is not None:
+                self.cambiadas.update(
+                    zip(
+                        np.asarray(estados).tolist(),
+                        np.asarray(acciones).tolist(),
+                    )
                 )
+            self.q_table.update_batch(
+                estados,
+                acciones,
+                recompensas,
+                siguientes,
+                dones,
+                self.alpha,
+                self.gamma,
+            )
+            return
 
-            if siguiente_estado is None:
+        q_table = self.q_table
+        if self.cambiadas is not None:
+            self.cambiadas.update(zip(estados, acciones))
+        errores = {}
+        for estado, accion, recompensa, siguiente, done in zip(
+            estados, acciones, recompensas, siguientes, dones
+        ):
+            if done:
                 q_target = recompensa
             else:
                 mejor_siguiente = max(
-                    self.q_table.get((siguiente_estado, a), 0)
-                    for a in ["UP", "DOWN", "LEFT", "RIGHT"]
+                    q_table.get((siguiente, a), 0) for a in self.acciones
                 )
                 q_target = recompensa + self.gamma * mejor_siguiente
+            key = (estado, accion)
+            suma, n = errores.get(key, (0.0, 0))
+            errores[key] = (suma + q_target - q_table.get(key, 0), n + 1)
 
-            q_actual = self.q_table.get((estado, accion), 0)
-            self.q_table[(estado, accion)] = q_actual + self.alpha * (
-                q_target - q_actual
+        for key, (suma, n) in errores.items():
+            q_table[key] = q_table.get(key, 0) + self.alpha * suma / n
+        if self.count_visits:
+            visitas = self.visitas
+            for key, (_, n) in errores.items():
+                visitas[key] = visitas.get(key, 0) + n
+
+    def replay_experiences(self, num_replays=20):
+        """
+        Re-aprende de experiencias guardadas, muestreadas en proporción
+        a su último error TD (las nuevas primero)
+        """
+        if len(self.replay_buffer) < 5:
+            return
+
+        indices, muestras = self.replay_buffer.sample(num_replays)
+        errores = [self._bellman(*muestra) for muestra in muestras]
+        self.replay_buffer.update_priorities(indices, errores)
+
+    def _bellman(self, estado, accion, recompensa, siguiente_estado):
+        """
+        Una actualización de Q (siguiente_estado None = estado final).
+        Devuelve el error TD antes de actualizar.
+        """
+        if self.cambiadas is not None:
+            self.cambiadas.add((estado, accion))
+        if self.dense:
+            return self.q_table.update(
+                estado,
+                accion,
+                recompensa,
+                siguiente_estado,
+                self.alpha,
+                self.gamma,
+            )
+
+        if siguiente_estado is None:
+            q_target = recompensa
+        else:
+            mejor_siguiente = max(
+                self.q_table.get((siguiente_estado, a), 0)
+                for a in self.acciones
             )
+            q_target = recompensa + self.gamma * mejor_siguiente
+
+        key = (estado, accion)
+        q_actual = self.q_table.get(key, 0)
+        error = q_target - q_actual
+        self.q_table[key] = q_actual + self.alpha * error
+        if self.count_visits:
+            self.visitas[key] = self.visitas.get(key, 0) + 1
+        return error
 
     def decay_epsilon(self):
         """
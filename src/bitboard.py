@@ -0,0 +1,367 @@
+import random
+from collections import deque
+from itertools import chain
+
+from src.environment import FreeCells
+
+
+class BitBoard:
+    """
+    Tablero alternativo con la misma API pública que Board, guardado como
+    máscaras de bits (un int de Python por tipo de objeto).
+
+    Las celdas se numeran sobre un tablero con un borde de muro alrededor:
+    bit = (y + 1) * stride + (x + 1), con stride = width + 2. Así salirse
+    del tablero es chocar con un bit de muro, y las consultas de "primer
+    objeto en una fila/columna" son desplazamientos y máscaras.
+    """
+
+    __slots__ = (
+        "width",
+        "height",
+        "num_green",
+        "num_red",
+        "stride",
+        "wall",
+        "snake",
+        "green",
+        "red",
+        "occupied",
+        "col_masks",
+        "segments",
+        "free",
+        "green_apples",
+        "red_apples",
+        "direction",
+        "len",
+        "game_over",
+        "rng",
+    )
+
+    DIRECTIONS = {
+        "UP": (0, -1),
+        "DOWN": (0, 1),
+        "LEFT": (-1, 0),
+        "RIGHT": (1, 0),
+    }
+    # move_snake acepta el nombre o el entero de la acción (0=UP ... 3=RIGHT)
+    MOVES = {**DIRECTIONS, **dict(enumerate(DIRECTIONS.values()))}
+
+    def __init__(
+        self, width=10, height=10, green_apples=2, red_apples=1, seed=None
+    ):
+        if max(width, height) < 4:
+            raise ValueError("El tablero necesita un lado de al menos 4")
+        self.width = width
+        self.height = height
+        self.num_green = green_apples
+        self.num_red = red_apples
+        self.rng = random.Random(seed)
+        self.stride = stride = width + 2
+
+        # Muro: primera y última fila y columna del tablero con borde
+        self.wall = 0
+        for py in range(height + 2):
+            for px in range(stride):
+                if px in (0, stride - 1) or py in (0, height + 1):
+                    self.wall |= 1 << (py * stride + px)
+        # Máscara de cada columna (con borde) para las consultas verticales
+        self.col_masks = [
+            sum(1 << (py * stride + px) for py in range(height + 2))
+            for px in range(stride)
+        ]
+
+        self.snake = 0
+        self.green = 0
+        self.red = 0
+        self.occupied = self.wall
+        self.segments = deque()  # bits de la serpiente, cabeza primero
+        self.free = FreeCells(width * height, self.rng)
+        self.green_apples = []  # (x, y) de cada manzana verde
+        self.red_apples = []  # (x, y) de cada manzana roja
+        self.direction = "UP"
+        self.len = 0
+        self.game_over = False
+        self.reset()
+
+    def _bit(self, x, y):
+        return (y + 1) * self.stride + x + 1
+
+    def _xy(self, bit):
+        py, px = divmod(bit, self.stride)
+        return px - 1, py - 1
+
+    def snk_eats_apple(self, apple):
+        """
+        Coloca una manzana en una celda libre al azar.
+        Devuelve False si el tablero está lleno y no cabe.
+        """
+        cell = self.free.sample()
+        if cell is None:
+            return False
+        self.free.remove(cell)
+        x, y = cell % self.width, cell // self.width
+        mask = 1 << self._bit(x, y)
+        self.occupied |= mask
+        if apple == 2:
+            self.green |= mask
+            self.green_apples.append((x, y))
+        else:
+            self.red |= mask
+            self.red_apples.append((x, y))
+        return True
+
+    def is_valid_position(self, new_x, new_y):
+        return 0 <= new_x < self.width and 0 <= new_y < self.height
+
+    def move_snake(self, direction):
+        dx, dy = self.MOVES[direction]
+        segments = self.segments
+        new = segments[0] + dx + dy * self.stride
+        mask = 1 << new
+
+        # Muro o cuerpo: comprobación de bits
+        if self.wall & mask or self.snake & mask:
+            self.game_over = True
+            return -10, self.game_over
+
+        new_x, new_y = self._xy(new)
+        if self.green & mask:
+            val = 2
+            self.green ^= mask
+        elif self.red & mask:
+            val = 3
+            self.red ^= mask
+        else:
+            val = 0
+            self.free.remove(new_y * self.width + new_x)
+            self.occupied |= mask
+
+        segments.appendleft(new)
+        self.snake |= mask
+
+        if val == 2:  # Manzana verde
+            self.len += 1
+            self.green_apples.remove((new_x, new_y))
+            self.snk_eats_apple(2)
+            return 10, self.game_over
+
+        elif val == 3:  # Manzana roja
+            self.red_apples.remove((new_x, new_y))
+            # Reducir longitud (eliminar 2 segmentos)
+            for _ in range(2):
+                if len(segments) > 1:
+                    self._pop_tail()
+
+            self.len -= 1
+            self.snk_eats_apple(3)
+
+            if self.len <= 0:
+                self.game_over = True
+                return -10, self.game_over
+            else:
+                return -1, self.game_over
+        else:  # Casilla vacía
+            self._pop_tail()
+            reward_pos = self._calcular_bonus_proximidad(new_x, new_y)
+            return reward_pos, self.game_over
+
+    def _pop_tail(self):
+        tail = self.segments.pop()
+        mask = 1 << tail
+        self.snake ^= mask
+        self.occupied ^= mask
+        tail_x, tail_y = self._xy(tail)
+        self.free.add(tail_y * self.width + tail_x)
+
+    def reset(self):
+        # Devolver al índice de libres solo las celdas ocupadas, en el
+        # mismo orden que Board.reset
+        cells = chain(
+            (self._xy(bit) for bit in self.segments),
+            self.green_apples,
+            self.red_apples,
+        )
+        for x, y in cells:
+            self.free.add(y * self.width + x)
+        self.snake = 0
+        self.green = 0
+        self.red = 0
+        self.occupied = self.wall
+        self.len = 3
+        self.game_over = False
+        self.segments.clear()
+        self.green_apples = []
+        self.red_apples = []
+        start = self.free.sample()
+        x, y = start % self.width, start // self.width
+        for direction_name, (dx, dy) in self.DIRECTIONS.items():
+            if self.is_valid_position(x + dx * 2, y + dy * 2):
+                for i in range(3):
+                    seg_x, seg_y = x + dx * i, y + dy * i
+                    bit = self._bit(seg_x, seg_y)
+                    self.segments.appendleft(bit)
+                    self.snake |= 1 << bit
+                for i in range(2, -1, -1):
+                    self.free.remove((y + dy * i) * self.width + x + dx * i)
+                self.occupied |= self.snake
+
+                self.direction = direction_name
+                break
+        for _ in range(self.num_green):
+            self.snk_eats_apple(2)
+        for _ in range(self.num_red):
+            self.snk_eats_apple(3)
+
+    def snapshot(self):
+        """
+        Captura el estado completo de la partida. Las máscaras son ints
+        inmutables, así que solo se copian el cuerpo y el índice de libres.
+        """
+        return (
+            self.snake,
+            self.green,
+            self.red,
+            self.occupied,
+            tuple(self.segments),
+            self.len,
+            self.direction,
+            self.game_over,
+            tuple(self.green_apples),
+            tuple(self.red_apples),
+            self.free.cells[:],
+            self.free.pos[:],
+            self.rng.getstate(),
+        )
+
+    def restore(self, snap):
+        """Vuelve al estado capturado por snapshot()"""
+        (
+            self.snake,
+            self.green,
+            self.red,
+            self.occupied,
+            segments,
+            self.len,
+            self.direction,
+            self.game_over,
+            green_apples,
+            red_apples,
+            free_cells,
+            free_pos,
+            rng_state,
+        ) = snap
+        self.segments.clear()
+        self.segments.extend(segments)
+        self.green_apples = list(green_apples)
+        self.red_apples = list(red_apples)
+        self.free.cells[:] = free_cells
+        self.free.pos[:] = free_pos
+        self.rng.setstate(rng_state)
+
+    def clone(self):
+        """Copia independiente de la partida, con su propio generador"""
+        other = BitBoard.__new__(BitBoard)
+        for name in ("width", "height", "num_green", "num_red", "stride"):
+            setattr(other, name, getattr(self, name))
+        other.wall = self.wall
+        other.col_masks = self.col_masks
+        other.rng = random.Random()
+        other.segments = deque()
+        other.free = FreeCells(0, other.rng)
+        other.restore(self.snapshot())
+        return other
+
+    def get_cell(self, x, y):
+        """Devuelve qué hay en una posición"""
+        if not self.is_valid_position(x, y):
+            return None
+        return self._value(self._bit(x, y))
+
+    def _value(self, bit):
+        mask = 1 << bit
+        if self.wall & mask:
+            return None
+        if self.snake & mask:
+            return 1
+        if self.green & mask:
+            return 2
+        if self.red & mask:
+            return 3
+        return 0
+
+    def first_along(self, direction):
+        """
+        Primer objeto desde la cabeza en una dirección, con operaciones de
+        bits. Devuelve (valor, distancia) con los valores de get_cell
+        (None = muro).
+        """
+        head = self.segments[0]
+        occupied = self.occupied
+        stride = self.stride
+
+        if direction == "RIGHT":
+            m = occupied >> (head + 1)
+            dist = (m & -m).bit_length()
+            hit = head + dist
+        elif direction == "LEFT":
+            m = occupied & ((1 << head) - 1)
+            hit = m.bit_length() - 1
+            dist = head - hit
+        elif direction == "DOWN":
+            m = (occupied & self.col_masks[head % stride]) >> (head + 1)
+            hit = head + (m & -m).bit_length()
+            dist = (hit - head) // stride
+        else:  # UP
+            m = occupied & self.col_masks[head % stride] & ((1 << head) - 1)
+            hit = m.bit_length() - 1
+            dist = (head - hit) // stride
+
+        return self._value(hit), dist
+
+    def count_free(self):
+        """Celdas libres del tablero (popcount de las no ocupadas)"""
+        all_cells = (1 << (self.stride * (self.height + 2))) - 1
+        return bin(all_cells & ~self.occupied).count("1")
+
+    @property
+    def board(self):
+        """Tablero como lista de listas (para Display y depuración)"""
+        return [
+            [self.get_cell(x, y) for x in range(self.width)]
+            for y in range(self.height)
+        ]
+
+    def get_head_position(self):
+        """Devuelve (x, y) de la cabeza"""
+        return self._xy(self.segments[0])
+
+    def get_length(self):
+        """Devuelve la longitud actual"""
+        return self.len
+
+    def is_game_over(self):
+        """Devuelve si terminó"""
+        return self.game_over
+
+    def printmap(self):
+        for i in self.board:
+            print(i)
+
+    def _calcular_bonus_proximidad(self, head_x, head_y):
+        """
+        Da pequeño bonus si la cabeza está cerca de una manzana verde
+        """
+        min_dist = float("inf")
+
+        for x, y in self.green_apples:
+            dist = abs(head_x - x) + abs(head_y - y)
+            if dist < min_dist:
+                min_dist = dist
+
+        if min_dist <= 2:
+            return 0.5
+        elif min_dist <= 4:
+            return 0.2
+        else:
+            return 0
@@ -0,0 +1,106 @@
+"""
+Checkpoints del entrenamiento en segundo plano.
+
+Cada checkpoint es un modelo binario (src/model_file.py) con el número
+de episodios jugados en el nombre: checkpoint-000120.bin. Se escribe en
+un archivo temporal que después se renombra, así que en el directorio
+nunca hay un checkpoint a medias.
+"""
+
+import os
+import re
+import threading
+
+from src.model_file import q_cells, write_binary
+
+PATTERN = re.compile(r"checkpoint-(\d+)\.bin")
+
+
+def checkpoint_path(directory, episode):
+    return os.path.join(directory, f"checkpoint-{episode:06d}.bin")
+
+
+def list_checkpoints(directory):
+    """[(episodio, ruta)] de los checkpoints de directory, del más viejo"""
+    if not os.path.isdir(directory):
+        return []
+    checkpoints = []
+    for name in os.listdir(directory):
+        match = PATTERN.fullmatch(name)
+        if match:
+            checkpoints.append(
+                (int(match.group(1)), os.path.join(directory, name))
+            )
+    return sorted(checkpoints)
+
+
+def latest_checkpoint(directory):
+    """(episodio, ruta) del checkpoint más reciente, o None"""
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+
+class Checkpointer:
+    """
+    Guarda un checkpoint cada every episodios sin parar el entrenamiento:
+    en el bucle solo se copia la Q-table (dict() o los arrays de la
+    densa); convertirla y escribirla se hace en un hilo. Si el anterior
+    aún no ha terminado, se le espera. Se conservan los keep últimos.
+    """
+
+    def __init__(self, directory, every, keep=3):
+        if every < 1 or keep < 1:
+            raise ValueError("every y keep tienen que ser >= 1")
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self._thread = None
+        self._error = None
+        os.makedirs(directory, exist_ok=True)
+
+    def maybe_save(self, agent, episode):
+        """Checkpoint si episode (episodios jugados) toca"""
+        if episode % self.every == 0:
+            self.save(agent, episode)
+
+    def save(self, agent, episode):
+        q_table = agent.q_table
+        snapshot = q_table.cells() if agent.dense else dict(q_table)
+        params = {
+            "epsilon": agent.epsilon,
+            "alpha": agent.alpha,
+            "gamma": agent.gamma,
+        }
+        self.wait()
+        self._thread = threading.Thread(
+            target=self._write,
+            args=(snapshot, agent.encoded, params, episode),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def wait(self):
+        """Espera al checkpoint en curso y relanza su error, si lo hubo"""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write(self, snapshot, encoded, params, episode):
+        try:
+            if isinstance(snapshot, dict):
+                celdas, valores = q_cells(snapshot, encoded)
+            else:
+                celdas, valores = snapshot
+            path = checkpoint_path(self.directory, episode)
+            tmp = path + ".tmp"
+            write_binary(tmp, celdas, valores, params)
+            with open(tmp, "rb+") as f:
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            for _, viejo in list_checkpoints(self.directory)[: -self.keep]:
+                os.remove(viejo)
+        except Exception as error:  # se relanza en wait()
+            self._error = error
@@ -0,0 +1,254 @@
+"""
+Modelo guardado como base + log de cambios (-save modelo.qlog).
+
+Un store es un directorio con:
+
+- base-<gen>.bin: un modelo binario completo (src/model_file.py).
+- log-<gen>.bin: bloques que solo se añaden al final, uno por guardado,
+  con el formato binario pero con DELTA_MAGIC y solo los pares que
+  cambiaron desde el guardado anterior (más los parámetros de entonces).
+  Un par con valor NaN es un par que ya no está en la Q-table.
+
+Cargar es leer la base y aplicar los bloques en orden. Cuando el log
+tiene más pares que la base, se compacta en la base de la generación
+siguiente. Hasta que esa base está completa (se escribe en un temporal
+y se renombra) la anterior y su log siguen siendo los válidos, así que
+un corte en cualquier momento deja el store legible; un bloque a medias
+al final del log se ignora al cargar.
+
+Abrir un store solo lee: el primer save o compact es el que corta ese
+bloque a medias y borra los restos de compactaciones cortadas, así que
+se puede cargar (-load) un store mientras otro proceso guarda en él.
+
+El primer save de un store abierto compara la Q-table entera; desde ahí
+el agente anota los pares que actualiza (Agent.cambiadas) y cada save
+solo mira esos. Los valores se guardan en float32, como en los .bin.
+"""
+
+import os
+import re
+
+import numpy as np
+
+from src.encoding import NUM_STATES
+from src.model_file import (
+    FORMAT_VERSION,
+    HEADER,
+    NUM_ACTIONS,
+    PARAMS,
+    pack_binary,
+    q_cells,
+    read_binary,
+)
+
+DELTA_MAGIC = b"L2SD"
+STORE_SUFFIX = ".qlog"
+PATTERN = re.compile(r"(base|log)-(\d+)\.bin")
+
+
+def is_store(path):
+    return os.path.isdir(path) and any(
+        PATTERN.fullmatch(name) for name in os.listdir(path)
+    )
+
+
+def _fsync_write(path, data, mode):
+    with open(path, mode) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class DeltaStore:
+    """
+    Store abierto: tiene en memoria el último estado guardado (valores y
+    qué pares existen, en arrays densos) para saber qué cambió en cada
+    save. Con compact_ratio=1.0 se compacta cuando el log tiene más
+    pares que la base.
+    """
+
+    def __init__(self, directory, compact_ratio=1.0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.compact_ratio = compact_ratio
+        size = NUM_STATES * NUM_ACTIONS
+        self._valores = np.zeros(size, dtype=np.float32)
+        self._presentes = np.zeros(size, dtype=bool)
+        self._escritor = False
+        # Agent cuyos cambios se siguen desde el último save
+        self._agente = None
+        while True:
+            try:
+                self._leer()
+                break
+            except FileNotFoundError:
+                # Otro proceso compactó mientras se leía: otra vez
+                continue
+
+    def _leer(self):
+        """Carga la base más reciente y los bloques completos de su log"""
+        self._valores[:] = 0
+        self._presentes[:] = False
+        self.params = {}
+        self.base_pairs = 0
+        self.log_pairs = 0
+        # Bytes del log que forman bloques completos
+        self._log_bytes = 0
+        bases = self._files("base")
+        self.gen = bases[-1] if bases else None
+        if self.gen is not None:
+            celdas, valores, self.params = read_binary(self._path("base"))
+            self._aplicar(celdas, valores)
+            self.base_pairs = len(celdas)
+            self._replay()
+
+    def _preparar(self):
+        """
+        Antes de la primera escritura: corta el bloque a medias del log y
+        borra los restos de otras generaciones (compactaciones cortadas)
+        """
+        if self._escritor:
+            return
+        self._escritor = True
+        if self.gen is not None and os.path.exists(self._path("log")):
+            with open(self._path("log"), "rb+") as f:
+                f.truncate(self._log_bytes)
+        for name in os.listdir(self.directory):
+            match = PATTERN.fullmatch(name)
+            if name.endswith(".tmp") or (
+                match and int(match.group(2)) != self.gen
+            ):
+                os.remove(os.path.join(self.directory, name))
+
+    def _files(self, kind):
+        """Generaciones con un archivo kind, de menor a mayor"""
+        return sorted(
+            int(match.group(2))
+            for match in map(PATTERN.fullmatch, os.listdir(self.directory))
+            if match and match.group(1) == kind
+        )
+
+    def _path(self, kind, gen=None):
+        gen = self.gen if gen is None else gen
+        return os.path.join(self.directory, f"{kind}-{gen:06d}.bin")
+
+    def _aplicar(self, celdas, valores):
+        """Escribe los pares en el estado (NaN: el par se borra)"""
+        self._valores[celdas] = valores
+        self._presentes[celdas] = ~np.isnan(valores)
+
+    def _replay(self):
+        """Aplica los bloques completos del log"""
+        path = self._path("log")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Sin log si la base no existe ya (compactada): lo ve _leer
+            if os.path.exists(self._path("base")):
+                return
+            raise
+        offset = 0
+        while offset + HEADER.size <= len(data):
+            magic, version, num_actions, n, *params = HEADER.unpack_from(
+                data, offset
+            )
+            if (
+                magic != DELTA_MAGIC
+                or version != FORMAT_VERSION
+                or num_actions != NUM_ACTIONS
+            ):
+                raise ValueError(f"{path}: bloque inválido en {offset}")
+            end = offset + HEADER.size + 8 * n
+            if end > len(data):
+                break
+            start = offset + HEADER.size
+            celdas = np.frombuffer(data, dtype="<i4", count=n, offset=start)
+            valores = np.frombuffer(
+                data, dtype="<f4", count=n, offset=start + 4 * n
+            )
+            self._aplicar(celdas, valores)
+            self.params = dict(zip(PARAMS, params))
+            self.log_pairs += n
+            offset = end
+        self._log_bytes = offset
+
+    def load(self):
+        """(celdas, valores, params) del último estado guardado"""
+        celdas = np.flatnonzero(self._presentes)
+        return celdas, self._valores[celdas], self.params
+
+    def save(self, agent):
+        """
+        Guarda los pares de agent que cambiaron desde el último save y
+        los que ya no están (o compacta), de forma que el store queda
+        igual que la Q-table de agent. Devuelve cuántos pares se
+        escribieron.
+        """
+        self._preparar()
+        # Solo los pares que agent actualizó desde el último save (las
+        # actualizaciones no borran pares) o, la primera vez, todos
+        incremental = self._agente is agent and agent.cambiadas is not None
+        celdas, valores = q_cells(
+            agent.q_table,
+            agent.encoded,
+            agent.cambiadas if incremental else None,
+        )
+        celdas = np.asarray(celdas, dtype=np.int64)
+        valores = np.asarray(valores, dtype=np.float32)
+        if incremental:
+            borradas = np.empty(0, dtype=np.int64)
+        else:
+            actuales = np.zeros_like(self._presentes)
+            actuales[celdas] = True
+            borradas = np.flatnonzero(self._presentes & ~actuales)
+        self._agente = agent
+        agent.cambiadas = set()
+
+        cambiadas = ~self._presentes[celdas] | (
+            self._valores[celdas] != valores
+        )
+        celdas = np.concatenate((celdas[cambiadas], borradas))
+        valores = np.concatenate(
+            (valores[cambiadas], np.full(len(borradas), np.nan, np.float32))
+        )
+        self._aplicar(celdas, valores)
+        self.params = {
+            "epsilon": agent.epsilon,
+            "alpha": agent.alpha,
+            "gamma": agent.gamma,
+        }
+
+        if (
+            self.gen is None
+            or self.log_pairs + len(celdas)
+            > self.compact_ratio * self.base_pairs
+        ):
+            return self.compact()
+        _fsync_write(
+            self._path("log"),
+            pack_binary(celdas, valores, self.params, DELTA_MAGIC),
+            "ab",
+        )
+        self.log_pairs += len(celdas)
+        return len(celdas)
+
+    def compact(self):
+        """
+        Escribe todo en la base de la generación siguiente y borra la
+        anterior y su log. Devuelve cuántos pares tiene la base.
+        """
+        self._preparar()
+        celdas, valores, params = self.load()
+        gen = 0 if self.gen is None else self.gen + 1
+        path = self._path("base", gen)
+        _fsync_write(path + ".tmp", pack_binary(celdas, valores, params), "wb")
+        os.replace(path + ".tmp", path)
+        if self.gen is not None:
+            for kind in ("base", "log"):
+                if os.path.exists(self._path(kind)):
+                    os.remove(self._path(kind))
+        self.gen = gen
+        self.base_pairs = len(celdas)
+        self.log_pairs = 0
+        return len(celdas)
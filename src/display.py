@@ -18,8 +18,9 @@ if not TKINTER_AVAILABLE and not PYGAME_AVAILABLE:
 
 
 class Display:
-    def __init__(self, board_size=10, cell_size=40, delay_ms=200):
-        self.board_size = board_size
+    def __init__(self, width=10, height=10, cell_size=40, delay_ms=200):
+        self.width = width
+        self.height = height
         self.cell_size = cell_size
         self.delay_ms = delay_ms
         self.enabled = True
@@ -84,8 +85,8 @@ class Display:
         self.window.title("Snake Game - Learn2Slither")
 
         # Canvas para el tablero
-        canvas_width = self.board_size * self.cell_size
-        canvas_height = self.board_size * self.cell_size
+        canvas_width = self.width * self.cell_size
+        canvas_height = self.height * self.cell_size
 
         self.canvas = tk.Canvas(
             self.window, width=canvas_width, height=canvas_height, bg="black"
@@ -123,22 +124,23 @@ class Display:
         self.canvas.delete("all")
 
         # Dibujar grid
-        for i in range(self.board_size + 1):
+        for i in range(self.width + 1):
             # Líneas verticales
             x = i * self.cell_size
             self.canvas.create_line(
-                x, 0, x, self.board_size * self.cell_size, fill="gray30"
+                x, 0, x, self.height * self.cell_size, fill="gray30"
             )
+        for i in range(self.height + 1):
             # Líneas horizontales
             y = i * self.cell_size
             self.canvas.create_line(
-                0, y, self.board_size * self.cell_size, y, fill="gray30"
+                0, y, self.width * self.cell_size, y, fill="gray30"
             )
 
         # Dibujar elementos del tablero
         board = board_obj.board
-        for y in range(self.board_size):
-            for x in range(self.board_size):
+        for y in range(self.height):
+            for x in range(self.width):
                 cell_value = board[y][x]
                 if cell_value != 0:
                     color = self._get_color(cell_value)
@@ -202,8 +204,8 @@ class Display:
         pygame.init()
 
         # Dimensiones de la ventana
-        window_width = self.board_size * self.cell_size
-        window_height = self.board_size * self.cell_size + 60  # +60 para info
+        window_width = self.width * self.cell_size
+        window_height = self.height * self.cell_size + 60  # +60 para info
 
         self.screen = pygame.display.set_mode((window_width, window_height))
         pygame.display.set_caption("Snake Game - Learn2Slither")
@@ -232,28 +234,29 @@ class Display:
         self.screen.fill((0, 0, 0))  # Negro
 
         # Dibujar grid
-        for i in range(self.board_size + 1):
+        for i in range(self.width + 1):
             # Líneas verticales
             pygame.draw.line(
                 self.screen,
                 (50, 50, 50),  # Gris oscuro
                 (i * self.cell_size, 0),
-                (i * self.cell_size, self.board_size * self.cell_size),
+                (i * self.cell_size, self.height * self.cell_size),
                 1,
             )
+        for i in range(self.height + 1):
             # Líneas horizontales
             pygame.draw.line(
                 self.screen,
                 (50, 50, 50),
                 (0, i * self.cell_size),
-                (self.board_size * self.cell_size, i * self.cell_size),
+                (self.width * self.cell_size, i * self.cell_size),
                 1,
             )
 
         # Dibujar elementos del tablero
         board = board_obj.board
-        for y in range(self.board_size):
-            for x in range(self.board_size):
+        for y in range(self.height):
+            for x in range(self.width):
                 cell_value = board[y][x]
                 if cell_value != 0:
                     color = self._get_color_rgb(cell_value)
@@ -283,8 +286,8 @@ class Display:
         # Fondo del panel
         info_rect = pygame.Rect(
             0,
-            self.board_size * self.cell_size,
-            self.board_size * self.cell_size,
+            self.height * self.cell_size,
+            self.width * self.cell_size,
             60,
         )
         pygame.draw.rect(self.screen, (200, 200, 200), info_rect)
@@ -293,8 +296,8 @@ class Display:
         text_surface = self.font.render(info_text, True, (0, 0, 0))
         text_rect = text_surface.get_rect(
             center=(
-                self.board_size * self.cell_size // 2,
-                self.board_size * self.cell_size + 20,
+                self.width * self.cell_size // 2,
+                self.height * self.cell_size + 20,
             )
         )
         self.screen.blit(text_surface, text_rect)
@@ -305,8 +308,8 @@ class Display:
             step_surface = self.font.render(step_text, True, (0, 0, 0))
             step_rect = step_surface.get_rect(
                 center=(
-                    self.board_size * self.cell_size // 2,
-                    self.board_size * self.cell_size + 45,
+                    self.width * self.cell_size // 2,
+                    self.height * self.cell_size + 45,
                 )
             )
             self.screen.blit(step_surface, step_rect)
@@ -0,0 +1,99 @@
+"""
+Codificación del estado comprimido y de las acciones como enteros.
+
+Un estado son 4 categorías (UP, DOWN, LEFT, RIGHT) de 9 posibles, así que
+cabe en un entero en base 9 (UP es la cifra más significativa):
+0 <= código < NUM_STATES. Las acciones son 0=UP, 1=DOWN, 2=LEFT, 3=RIGHT.
+"""
+
+from functools import lru_cache
+
+CATEGORIES = (
+    "SAFE",
+    "DANGER_IMM",
+    "DANGER_NEAR",
+    "DANGER_FAR",
+    "FOOD_CLOSE",
+    "FOOD_NEAR",
+    "FOOD_FAR",
+    "BAD_CLOSE",
+    "BAD_FAR",
+)
+CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORIES)}
+NUM_CATEGORIES = len(CATEGORIES)
+NUM_STATES = NUM_CATEGORIES**4
+
+# Peso de la categoría de cada dirección dentro del código
+WEIGHTS = (NUM_CATEGORIES**3, NUM_CATEGORIES**2, NUM_CATEGORIES, 1)
+
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+ACTION_INDEX = {accion: i for i, accion in enumerate(ACTIONS)}
+
+
+def encode_state(estado):
+    """Tupla de 4 categorías -> entero"""
+    code = 0
+    for cat in estado:
+        code = code * NUM_CATEGORIES + CATEGORY_INDEX[cat]
+    return code
+
+
+def decode_state(code):
+    """Entero -> tupla de 4 categorías"""
+    cats = []
+    for weight in WEIGHTS:
+        digit, code = divmod(code, weight)
+        cats.append(CATEGORIES[digit])
+    return tuple(cats)
+
+
+def encode_action(accion):
+    """Nombre de la acción -> 0-3"""
+    return ACTION_INDEX[accion]
+
+
+def decode_action(accion):
+    """0-3 -> nombre de la acción"""
+    return ACTIONS[accion]
+
+
+def _tabla_acciones(condicion, vacia=()):
+    """
+    Para cada estado codificado, las acciones (0-3) cuya categoría cumple
+    condicion; vacia si no la cumple ninguna
+    """
+    tabla = []
+    for code in range(NUM_STATES):
+        acciones = tuple(
+            i for i, cat in enumerate(decode_state(code)) if condicion(cat)
+        )
+        tabla.append(acciones or vacia)
+    return tuple(tabla)
+
+
+# Máscaras de acciones precalculadas por estado codificado
+SAFE_ACTIONS = _tabla_acciones(lambda cat: cat != "DANGER_IMM")
+FOOD_ACTIONS = _tabla_acciones(lambda cat: cat.startswith("FOOD"))
+# Acciones seguras o, si no hay ninguna, las 4
+VALID_ACTIONS = _tabla_acciones(
+    lambda cat: cat != "DANGER_IMM", vacia=(0, 1, 2, 3)
+)
+
+
+@lru_cache(maxsize=None)
+def action_tables(encoded=True):
+    """
+    (SAFE_ACTIONS, FOOD_ACTIONS, VALID_ACTIONS). Sin codificar, cada tabla
+    es un dict indexado por la tupla de categorías con las acciones por
+    nombre
+    """
+    tablas = (SAFE_ACTIONS, FOOD_ACTIONS, VALID_ACTIONS)
+    if encoded:
+        return tablas
+    return tuple(
+        {
+            decode_state(code): tuple(ACTIONS[a] for a in acciones)
+            for code, acciones in enumerate(tabla)
+        }
+        for tabla in tablas
+    )
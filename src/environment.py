@@ -1,23 +1,115 @@
 import random
+from collections import deque
+from itertools import chain
+
+
+class FreeCells:
+    """
+    Índice de celdas libres (celda = y * ancho + x).
+    Alta, baja y muestreo aleatorio en O(1).
+    """
+
+    __slots__ = ("cells", "pos", "rng")
+
+    def __init__(self, num_cells, rng=random):
+        self.cells = list(range(num_cells))
+        # Posición de cada celda dentro de self.cells (-1 si está ocupada)
+        self.pos = list(range(num_cells))
+        self.rng = rng
+
+    def __len__(self):
+        return len(self.cells)
+
+    def remove(self, cell):
+        """Marca la celda como ocupada (debe estar libre)"""
+        i = self.pos[cell]
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.pos[last] = i
+        self.pos[cell] = -1
+
+    def add(self, cell):
+        """Marca la celda como libre (debe estar ocupada)"""
+        self.pos[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def sample(self):
+        """Devuelve una celda libre al azar, o None si no queda ninguna"""
+        if not self.cells:
+            return None
+        return self.rng.choice(self.cells)
 
 
 class Board:
-    def __init__(self):
-        self.segments = []  # (x, y)
-        self.board = [[0 for _ in range(10)] for _ in range(10)]
+    __slots__ = (
+        "width",
+        "height",
+        "num_green",
+        "num_red",
+        "segments",
+        "board",
+        "free",
+        "row_count",
+        "col_count",
+        "green_apples",
+        "red_apples",
+        "direction",
+        "len",
+        "game_over",
+        "rng",
+        "version",
+        "changes",
+    )
+
+    def __init__(
+        self, width=10, height=10, green_apples=2, red_apples=1, seed=None
+    ):
+        if max(width, height) < 4:
+            raise ValueError("El tablero necesita un lado de al menos 4")
+        self.width = width
+        self.height = height
+        self.num_green = green_apples
+        self.num_red = red_apples
+        # Generador propio: snapshot() puede capturar y restaurar su estado
+        self.rng = random.Random(seed)
+        self.segments = deque()  # (x, y), cabeza primero
+        self.board = [[0 for _ in range(width)] for _ in range(height)]
+        self.free = FreeCells(width * height, self.rng)
+        # Celdas ocupadas por fila y por columna (atajos de visión)
+        self.row_count = [0] * height
+        self.col_count = [0] * width
+        self.green_apples = []  # (x, y) de cada manzana verde
+        self.red_apples = []  # (x, y) de cada manzana roja
         self.direction = "UP"
         self.len = 0
         self.game_over = False
+        # Contador de modificaciones y celdas cambiadas en el último
+        # move_snake (None tras reset/restore: cambió todo el tablero)
+        self.version = 0
+        self.changes = None
         self.reset()
         pass
 
     def snk_eats_apple(self, apple):
-        while True:
-            x = random.randint(0, 9)
-            y = random.randint(0, 9)
-            if self.board[y][x] == 0:
-                break
+        """
+        Coloca una manzana en una celda libre al azar.
+        Devuelve False si el tablero está lleno y no cabe.
+        """
+        cell = self.free.sample()
+        if cell is None:
+            return False
+        self.free.remove(cell)
+        x, y = cell % self.width, cell // self.width
         self.board[y][x] = apple
+        self.row_count[y] += 1
+        self.col_count[x] += 1
+        self.changes.append((x, y))
+        if apple == 2:
+            self.green_apples.append((x, y))
+        else:
+            self.red_apples.append((x, y))
+        return True
 
     DIRECTIONS = {
         "UP": (0, -1),
@@ -25,14 +117,20 @@ class Board:
         "LEFT": (-1, 0),
         "RIGHT": (1, 0),
     }
+    # move_snake acepta el nombre o el entero de la acción (0=UP ... 3=RIGHT)
+    MOVES = {**DIRECTIONS, **dict(enumerate(DIRECTIONS.values()))}
 
     def is_valid_position(self, new_x, new_y):
-        return 0 <= new_x < 10 and 0 <= new_y < 10
+        return 0 <= new_x < self.width and 0 <= new_y < self.height
 
     def move_snake(self, direction):
-        dx, dy = self.DIRECTIONS[direction]
-        new_x = self.segments[0][0] + dx
-        new_y = self.segments[0][1] + dy
+        dx, dy = self.MOVES[direction]
+        segments = self.segments
+        head_x, head_y = segments[0]
+        self.version += 1
+        changes = self.changes = []
+        new_x = head_x + dx
+        new_y = head_y + dy
 
         # 1. PRIMERO: Validar límites del tablero
         if not self.is_valid_position(new_x, new_y):
@@ -48,22 +146,32 @@ class Board:
             return -10, self.game_over
 
         # 4. AHORA SÍ: Mover la cabeza
-        self.segments.insert(0, (new_x, new_y))
+        segments.appendleft((new_x, new_y))
         self.board[new_y][new_x] = 1
+        changes.append((new_x, new_y))
+        if val == 0:
+            self.free.remove(new_y * self.width + new_x)
+            self.row_count[new_y] += 1
+            self.col_count[new_x] += 1
 
         # 5. Procesar según qué comió
         if val == 2:  # Manzana verde
             self.len += 1
+            self.green_apples.remove((new_x, new_y))
             self.snk_eats_apple(2)
             return 10, self.game_over  # Recompensa alta
 
         elif val == 3:  # Manzana roja
+            self.red_apples.remove((new_x, new_y))
             # Reducir longitud (eliminar 2 segmentos)
             for _ in range(2):
-                if len(self.segments) > 1:
-                    tail_x, tail_y = self.segments[-1]
+                if len(segments) > 1:
+                    tail_x, tail_y = segments.pop()
                     self.board[tail_y][tail_x] = 0
-                    self.segments.pop()
+                    changes.append((tail_x, tail_y))
+                    self.free.add(tail_y * self.width + tail_x)
+                    self.row_count[tail_y] -= 1
+                    self.col_count[tail_x] -= 1
 
             self.len -= 1
             self.snk_eats_apple(3)
@@ -75,36 +183,117 @@ class Board:
                 return -1, self.game_over
         else:  # Casilla vacía (val == 0)
             # Eliminar la cola
-            tail_x, tail_y = self.segments[-1]
+            tail_x, tail_y = segments.pop()
             self.board[tail_y][tail_x] = 0
-            self.segments.pop()
+            changes.append((tail_x, tail_y))
+            self.free.add(tail_y * self.width + tail_x)
+            self.row_count[tail_y] -= 1
+            self.col_count[tail_x] -= 1
             reward_pos = self._calcular_bonus_proximidad(new_x, new_y)
             return reward_pos, self.game_over
 
     def reset(self):
-        self.board = [[0 for _ in range(10)] for _ in range(10)]
+        # Vaciar solo las celdas ocupadas: el coste depende de la
+        # longitud de la serpiente y no del área del tablero
+        for x, y in chain(self.segments, self.green_apples, self.red_apples):
+            self.board[y][x] = 0
+            self.free.add(y * self.width + x)
+            self.row_count[y] -= 1
+            self.col_count[x] -= 1
         self.len = 3
         self.game_over = False
-        self.segments = []
-        while True:
-            x = random.randint(0, 9)
-            y = random.randint(0, 9)
-            if self.board[y][x] == 0:
-                break
+        self.changes = []
+        self.segments.clear()
+        self.green_apples = []
+        self.red_apples = []
+        start = self.free.sample()
+        x, y = start % self.width, start // self.width
         for direction_name, (dx, dy) in self.DIRECTIONS.items():
             if self.is_valid_position(x + dx * 2, y + dy * 2):
-                self.segments.insert(0, (x, y))
-                self.segments.insert(0, (x + dx, y + dy))
-                self.segments.insert(0, (x + dx * 2, y + dy * 2))
-                self.board[y + dy * 2][x + dx * 2] = 1
-                self.board[y + dy][x + dx] = 1
-                self.board[y][x] = 1
+                self.segments.appendleft((x, y))
+                self.segments.appendleft((x + dx, y + dy))
+                self.segments.appendleft((x + dx * 2, y + dy * 2))
+                for seg_x, seg_y in self.segments:
+                    self.board[seg_y][seg_x] = 1
+                    self.free.remove(seg_y * self.width + seg_x)
+                    self.row_count[seg_y] += 1
+                    self.col_count[seg_x] += 1
 
                 self.direction = direction_name
                 break
-        self.snk_eats_apple(2)
-        self.snk_eats_apple(2)
-        self.snk_eats_apple(3)
+        for _ in range(self.num_green):
+            self.snk_eats_apple(2)
+        for _ in range(self.num_red):
+            self.snk_eats_apple(3)
+        self.version += 1
+        self.changes = None
+
+    def snapshot(self):
+        """
+        Captura el estado completo de la partida (tablero, cuerpo,
+        longitud, dirección, game_over y generador aleatorio) en una tupla
+        inmutable que se puede restaurar tantas veces como haga falta.
+        """
+        return (
+            [row[:] for row in self.board],
+            tuple(self.segments),
+            self.len,
+            self.direction,
+            self.game_over,
+            tuple(self.green_apples),
+            tuple(self.red_apples),
+            self.free.cells[:],
+            self.free.pos[:],
+            self.row_count[:],
+            self.col_count[:],
+            self.rng.getstate(),
+        )
+
+    def restore(self, snap):
+        """Vuelve al estado capturado por snapshot()"""
+        (
+            board,
+            segments,
+            self.len,
+            self.direction,
+            self.game_over,
+            green_apples,
+            red_apples,
+            free_cells,
+            free_pos,
+            row_count,
+            col_count,
+            rng_state,
+        ) = snap
+        # Copias en el sitio: quien tenga referencias al tablero las conserva
+        for row, saved in zip(self.board, board):
+            row[:] = saved
+        self.segments.clear()
+        self.segments.extend(segments)
+        self.green_apples = list(green_apples)
+        self.red_apples = list(red_apples)
+        self.free.cells[:] = free_cells
+        self.free.pos[:] = free_pos
+        self.row_count[:] = row_count
+        self.col_count[:] = col_count
+        self.rng.setstate(rng_state)
+        self.version += 1
+        self.changes = None
+
+    def clone(self):
+        """Copia independiente de la partida, con su propio generador"""
+        other = Board.__new__(Board)
+        for name in ("width", "height", "num_green", "num_red"):
+            setattr(other, name, getattr(self, name))
+        other.rng = random.Random()
+        other.segments = deque()
+        other.board = [[0] * self.width for _ in range(self.height)]
+        other.free = FreeCells(0, other.rng)
+        other.row_count = []
+        other.col_count = []
+        other.version = 0
+        other.restore(self.snapshot())
+        return other
 
     def get_cell(self, x, y):
         """Devuelve qué hay en una posición"""
@@ -134,12 +323,11 @@ class Board:
         """
         min_dist = float("inf")
 
-        # Encontrar manzana verde más cercana
-        for y in range(10):
-            for x in range(10):
-                if self.board[y][x] == 2:  # Manzana verde
-                    dist = abs(head_x - x) + abs(head_y - y)  # Distancia
-                    min_dist = min(min_dist, dist)
+        # Manzana verde más cercana entre las conocidas
+        for x, y in self.green_apples:
+            dist = abs(head_x - x) + abs(head_y - y)  # Distancia
+            if dist < min_dist:
+                min_dist = dist
 
         # Bonus muy pequeño basado en proximidad
         if min_dist <= 2:
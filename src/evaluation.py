@@ -0,0 +1,234 @@
+"""
+Evaluación de un modelo en paralelo (-eval-workers N).
+
+Los episodios se reparten en bloques de batch_size entre un pool de
+procesos. El bloque i usa la semilla worker_seed(seed, i) para su
+tablero y su exploración. Cada proceso rehace el Agent al arrancar a
+partir de su Q-table (o de la ruta del modelo con -qtable mmap, y así
+todos comparten el archivo mapeado), así que funciona tanto con fork
+como con spawn (macOS, Windows). Los bloques se usan
+en orden, así que con la misma semilla el resultado no depende del
+número de procesos ni de cuál termina antes.
+
+Con tol > 0 la evaluación se para (parada secuencial) cuando el
+intervalo de confianza de la media de metric es más estrecho que
+tol * media, y ya hay al menos min_episodes.
+"""
+
+import multiprocessing as mp
+import random
+import time
+from statistics import NormalDist
+
+import numpy as np
+
+from src.agent import Agent
+from src.interpreter import Interpreter
+from src.model_file import load_cells, q_cells
+from src.qtable import MappedQTable
+from src.training import BACKENDS, test_episode, worker_seed
+
+# Columnas de cada episodio (las cuatro primeras las da test_episode)
+COLUMNS = ("length", "max_length", "apples", "steps", "wall_s")
+SUMMARY = ("length", "max_length", "apples", "steps")
+
+# Agent de cada proceso del pool (lo crea _init_worker)
+_agent = None
+
+
+def _exportar_agente(agent):
+    """Lo necesario para rehacer agent en otro proceso (se puede pickle)"""
+    config = {
+        "encoded": agent.encoded,
+        "epsilon": agent.epsilon,
+        "alpha": agent.alpha,
+        "gamma": agent.gamma,
+    }
+    if isinstance(agent.q_table, MappedQTable):
+        config["q_backend"] = "mmap"
+        config["model_path"] = agent.q_table.filepath
+    else:
+        # La compartida se copia: aquí solo se lee
+        config["q_backend"] = "dense" if agent.dense else "dict"
+        config["cells"] = q_cells(agent.q_table, agent.encoded)
+    return config
+
+
+def _init_worker(config):
+    """Inicializador del pool: crea el Agent del proceso"""
+    global _agent
+    _agent = Agent(
+        encoded=config["encoded"],
+        q_backend=config["q_backend"],
+        model_path=config.get("model_path"),
+    )
+    if "cells" in config:
+        load_cells(_agent.q_table, *config["cells"], _agent.encoded)
+    _agent.epsilon = config["epsilon"]
+    _agent.alpha = config["alpha"]
+    _agent.gamma = config["gamma"]
+
+
+def _eval_batch(tarea):
+    """Juega un bloque de episodios; devuelve (índice, filas)"""
+    indice, num_episodes, config = tarea
+    seed = worker_seed(config["seed"], indice)
+    random.seed(seed)
+    board = BACKENDS[config["backend"]](
+        config["width"],
+        config["height"],
+        config["green_apples"],
+        config["red_apples"],
+        seed=seed,
+    )
+    interpreter = Interpreter(board, encoded=_agent.encoded)
+    filas = []
+    for _ in range(num_episodes):
+        start = time.perf_counter()
+        fila = test_episode(_agent, board, interpreter, config["max_steps"])
+        filas.append(fila + (time.perf_counter() - start,))
+    return indice, filas
+
+
+def summarize(valores, confidence=0.95):
+    """Media, desviación, mediana, p10/p90 e intervalo de confianza"""
+    valores = np.asarray(valores, dtype=float)
+    n = len(valores)
+    media = float(valores.mean())
+    std = float(valores.std(ddof=1)) if n > 1 else 0.0
+    # Aproximación normal: con cientos de episodios basta
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    margen = z * std / np.sqrt(n)
+    p10, mediana, p90 = np.percentile(valores, (10, 50, 90))
+    return {
+        "n": n,
+        "mean": media,
+        "std": std,
+        "median": float(mediana),
+        "p10": float(p10),
+        "p90": float(p90),
+        "ci_low": media - margen,
+        "ci_high": media + margen,
+    }
+
+
+def evaluate(
+    agent,
+    num_episodes,
+    num_workers,
+    batch_size=50,
+    seed=None,
+    tol=0.0,
+    metric="length",
+    min_episodes=200,
+    confidence=0.95,
+    max_steps=5000,
+    verbose=True,
+    metrics=None,
+    backend="grid",
+    width=10,
+    height=10,
+    green_apples=2,
+    red_apples=1,
+):
+    """
+    Juega hasta num_episodes episodios de prueba (epsilon 0.05, como
+    main.test) con num_workers procesos. Con metrics (MetricsSink)
+    registra cada episodio.
+
+    Devuelve {columna: summarize(...)} más "episodes", "stopped_early"
+    y "seconds".
+    """
+    if metric not in SUMMARY:
+        raise ValueError(f"Métrica desconocida: {metric}")
+    config = {
+        "seed": seed,
+        "backend": backend,
+        "width": width,
+        "height": height,
+        "green_apples": green_apples,
+        "red_apples": red_apples,
+        "max_steps": max_steps,
+    }
+    tareas = [
+        (i, min(batch_size, num_episodes - inicio), config)
+        for i, inicio in enumerate(range(0, num_episodes, batch_size))
+    ]
+
+    exportado = _exportar_agente(agent)
+    exportado["epsilon"] = 0.05
+    start = time.perf_counter()
+    listos = {}
+    filas = []
+    siguiente = 0  # primer bloque aún no añadido a filas
+    parada = False
+    pool = mp.Pool(
+        num_workers, initializer=_init_worker, initargs=(exportado,)
+    )
+    try:
+        for indice, bloque in pool.imap_unordered(_eval_batch, tareas):
+            listos[indice] = bloque
+            # Solo los bloques en orden cuentan para la parada
+            while siguiente in listos:
+                filas.extend(listos.pop(siguiente))
+                siguiente += 1
+                # Tras el último bloque ya no hay nada que parar
+                if (
+                    tol > 0
+                    and len(filas) >= min_episodes
+                    and siguiente < len(tareas)
+                ):
+                    r = summarize([f[SUMMARY.index(metric)] for f in filas])
+                    ancho = (r["ci_high"] - r["ci_low"]) / 2
+                    if ancho <= tol * abs(r["mean"]):
+                        parada = True
+                        break
+            if parada:
+                break
+    finally:
+        pool.terminate()
+        pool.join()
+    segundos = time.perf_counter() - start
+
+    if metrics is not None:
+        for episode, fila in enumerate(filas, 1):
+            length, max_length, apples, steps, wall_s = fila
+            metrics.record(
+                "eval",
+                episode,
+                length,
+                max_length,
+                apples,
+                steps,
+                0.05,
+                len(agent.q_table),
+                wall_s,
+            )
+
+    columnas = list(zip(*filas))
+    resultado = {
+        nombre: summarize(columnas[COLUMNS.index(nombre)], confidence)
+        for nombre in SUMMARY
+    }
+    resultado["episodes"] = len(filas)
+    resultado["stopped_early"] = parada
+    resultado["seconds"] = segundos
+
+    if verbose:
+        print(
+            f"\n=== EVALUACIÓN ({len(filas)} episodios, {num_workers} "
+            f"procesos, {segundos:.2f} s"
+            f"{', parada temprana' if parada else ''}) ==="
+        )
+        print(
+            f"{'':>10} | {'media':>8} | {'std':>7} | {'mediana':>7} | "
+            f"{'p10':>6} | {'p90':>6} | IC {confidence:.0%}"
+        )
+        for nombre in SUMMARY:
+            r = resultado[nombre]
+            print(
+                f"{nombre:>10} | {r['mean']:8.2f} | {r['std']:7.2f} | "
+                f"{r['median']:7.1f} | {r['p10']:6.1f} | {r['p90']:6.1f} | "
+                f"[{r['ci_low']:.2f}, {r['ci_high']:.2f}]"
+            )
+    return resultado
@@ -1,55 +1,150 @@
+from src.encoding import CATEGORY_INDEX, WEIGHTS, encode_state
+
+# Categoría según el valor de get_cell (None = muro) y la distancia.
+# Índice = distancia recortada a 6: desde ahí todas son *_FAR
+_DANGER = (
+    None,
+    "DANGER_IMM",
+    "DANGER_NEAR",
+    "DANGER_NEAR",
+    "DANGER_FAR",
+    "DANGER_FAR",
+    "DANGER_FAR",
+)
+_FOOD = (
+    None,
+    "FOOD_CLOSE",
+    "FOOD_CLOSE",
+    "FOOD_NEAR",
+    "FOOD_NEAR",
+    "FOOD_NEAR",
+    "FOOD_FAR",
+)
+_BAD = (
+    None,
+    "BAD_CLOSE",
+    "BAD_CLOSE",
+    "BAD_FAR",
+    "BAD_FAR",
+    "BAD_FAR",
+    "BAD_FAR",
+)
+CATEGORIAS = {None: _DANGER, 1: _DANGER, 2: _FOOD, 3: _BAD}
+
+# Direcciones de los rayos en el orden del estado: UP, DOWN, LEFT, RIGHT.
+# Índice de cada desplazamiento de la cabeza; el opuesto de d es d ^ 1
+_MOVE_INDEX = {(0, -1): 0, (0, 1): 1, (-1, 0): 2, (1, 0): 3}
+
+# Tablas de rayos por tamaño de tablero, compartidas entre intérpretes
+_RAY_TABLES = {}
+
+
+def category_table(max_dist, weight=None):
+    """
+    CATEGORIAS con las tuplas alargadas hasta max_dist, para indexar por
+    la distancia sin recortarla. Con weight, cada categoría se sustituye
+    por su índice multiplicado por weight (su parte del estado codificado)
+    """
+    tables = {}
+    for valor, tabla in CATEGORIAS.items():
+        tabla = tabla + (tabla[-1],) * (max_dist + 1 - len(tabla))
+        if weight is not None:
+            tabla = tuple(
+                None if cat is None else CATEGORY_INDEX[cat] * weight
+                for cat in tabla
+            )
+        tables[valor] = tabla
+    return tables
+
+
+def ray_table(width, height):
+    """
+    Para cada celda (y * width + x), las coordenadas que recorre cada rayo
+    en orden de distancia: (UP, DOWN, LEFT, RIGHT). Los rayos verticales
+    son rangos de y y los horizontales rangos de x.
+    """
+    table = _RAY_TABLES.get((width, height))
+    if table is None:
+        table = [
+            (
+                range(y - 1, -1, -1),
+                range(y + 1, height),
+                range(x - 1, -1, -1),
+                range(x + 1, width),
+            )
+            for y in range(height)
+            for x in range(width)
+        ]
+        _RAY_TABLES[(width, height)] = table
+    return table
+
+
 class Interpreter:
-    def __init__(self, board):
+    def __init__(self, board, encoded=False):
+        """
+        Con encoded=True, get_compressed_state devuelve el estado como un
+        entero (ver src/encoding.py) en vez de la tupla de categorías.
+        """
         self.env = board
-        pass
+        self.encoded = encoded
+        # Los tableros de bits resuelven cada rayo con operaciones de bits
+        self._first_along = getattr(board, "first_along", None)
+        if self._first_along is None:
+            self._rays = ray_table(board.width, board.height)
+        max_dist = max(board.width, board.height) + 1
+        if encoded:
+            self._cats = None
+            self._pesos = tuple(category_table(max_dist, w) for w in WEIGHTS)
+        else:
+            self._cats = category_table(max_dist)
+        # Visión del último estado calculado, para actualizarla con las
+        # celdas que cambie el siguiente move_snake
+        self._version = -1
+        self._head = None
+        self._hits = None
+        self._state = None
 
     def get_state(self):
         head_x, head_y = self.env.get_head_position()
-        state = ""
+        width, height = self.env.width, self.env.height
+        pad = " " * (head_x + 1)
+        state = []
 
         # UP - construir desde arriba hacia la cabeza para que aparezca arriba
-        for x in range(0, head_x + 1):
-            state += " "
-        state += "W\n"
+        state.append(pad + "W\n")
         for y in range(0, head_y):  # Desde 0 hasta justo antes de la cabeza
-            for x in range(0, head_x + 1):
-                state += " "
             char = self.get_char_at(head_x, y)
-            state += char + "\n"
+            state.append(pad + char + "\n")
             if char == "W":
                 break
         # LEFT - construir desde la izquierda hacia la cabeza
-        state += "W"
+        state.append("W")
         for x in range(0, head_x):  # Desde 0 hasta justo antes de la cabeza
             char = self.get_char_at(x, head_y)
-            state += char
+            state.append(char)
             if char == "W":
                 break
 
         # HEAD
-        state += "H"
+        state.append("H")
 
         # RIGHT - desde la cabeza hacia la derecha
-        for x in range(head_x + 1, 10):
+        for x in range(head_x + 1, width):
             char = self.get_char_at(x, head_y)
-            state += char
+            state.append(char)
             if char == "W":
                 break
-        state += "W\n"
+        state.append("W\n")
 
         # DOWN - desde la cabeza hacia abajo
-        for y in range(head_y + 1, 10):
-            for x in range(0, head_x + 1):
-                state += " "
+        for y in range(head_y + 1, height):
             char = self.get_char_at(head_x, y)
-            state += char + "\n"
+            state.append(pad + char + "\n")
             if char == "W":
                 break
-        for x in range(0, head_x + 1):
-            state += " "
-        state += "W"
+        state.append(pad + "W")
 
-        return state
+        return "".join(state)
 
     def get_char_at(self, x, y):
         cell = self.env.get_cell(x, y)
@@ -68,6 +163,56 @@ class Interpreter:
         """
         Estado con información de peligros Y comida.
         Más rico que solo DANGER/SAFE pero no demasiado complejo.
+
+        Recorre las 4 líneas de visión directamente sobre env.board, sin
+        construir el dibujo de get_state: coste O(ancho + alto).
+        """
+        if self._first_along is not None:
+            first_along = self._first_along
+            up = first_along("UP")
+            down = first_along("DOWN")
+            left = first_along("LEFT")
+            right = first_along("RIGHT")
+            return self._categorias(up, down, left, right)
+
+        env = self.env
+        version = env.version
+        if version == self._version:
+            return self._state
+
+        head = env.segments[0]
+        if env.changes is not None and version == self._version + 1:
+            hits = self._update_hits(head, env.changes)
+        else:
+            hits = self._ray_cast(head)
+
+        self._version = version
+        self._head = head
+        self._hits = hits
+        self._state = self._categorias(*hits)
+        return self._state
+
+    def _categorias(self, up, down, left, right):
+        cats = self._cats
+        if cats is None:
+            p_up, p_down, p_left, p_right = self._pesos
+            return (
+                p_up[up[0]][up[1]]
+                + p_down[down[0]][down[1]]
+                + p_left[left[0]][left[1]]
+                + p_right[right[0]][right[1]]
+            )
+        return (
+            cats[up[0]][up[1]],
+            cats[down[0]][down[1]],
+            cats[left[0]][left[1]],
+            cats[right[0]][right[1]],
+        )
+
+    def get_compressed_state_from_text(self):
+        """
+        Mismo estado que get_compressed_state, extraído del dibujo de
+        get_state. Más lento; útil para depurar la visión.
         """
         full_state = self.get_state()
         lines = full_state.strip().split("\n")
@@ -87,34 +232,115 @@ class Interpreter:
             tipo, dist = self._extract_direction_info(
                 lines, head_line_idx, head_col, direction
             )
+            state_compressed.append(self._categorizar(tipo, dist))
 
-            # Categorizar con más detalle
-            if tipo in ["W", "S"]:  # Peligro
-                if dist <= 1:
-                    categoria = "DANGER_IMM"  # Immediate
-                elif dist <= 3:
-                    categoria = "DANGER_NEAR"
-                else:
-                    categoria = "DANGER_FAR"
-            elif tipo == "G":  # Manzana verde
-                if dist <= 2:
-                    categoria = "FOOD_CLOSE"
-                elif dist <= 5:
-                    categoria = "FOOD_NEAR"
-                else:
-                    categoria = "FOOD_FAR"
-            elif tipo == "R":  # Manzana roja
-                if dist <= 2:
-                    categoria = "BAD_CLOSE"
-                else:
-                    categoria = "BAD_FAR"
-            else:  # Vacío
-                categoria = "SAFE"
-
-            state_compressed.append(categoria)
-
+        if self.encoded:
+            return encode_state(state_compressed)
         return tuple(state_compressed)
 
+    def _categorizar(self, tipo, dist):
+        """Traduce (tipo, distancia) a la categoría del estado"""
+        if tipo in ["W", "S"]:  # Peligro
+            if dist <= 1:
+                return "DANGER_IMM"  # Immediate
+            elif dist <= 3:
+                return "DANGER_NEAR"
+            else:
+                return "DANGER_FAR"
+        elif tipo == "G":  # Manzana verde
+            if dist <= 2:
+                return "FOOD_CLOSE"
+            elif dist <= 5:
+                return "FOOD_NEAR"
+            else:
+                return "FOOD_FAR"
+        elif tipo == "R":  # Manzana roja
+            if dist <= 2:
+                return "BAD_CLOSE"
+            else:
+                return "BAD_FAR"
+        else:  # Vacío
+            return "SAFE"
+
+    def _ray_cast(self, head, hits=None, directions=(0, 1, 2, 3)):
+        """
+        Primer objeto no-vacío desde la cabeza en cada dirección (0-3 =
+        UP, DOWN, LEFT, RIGHT) de directions, recorriendo las celdas de
+        la tabla de rayos. Escribe en hits (o en una lista nueva) tuplas
+        (valor, distancia); el muro tiene valor None.
+        """
+        env = self.env
+        board = env.board
+        head_x, head_y = head
+        rays = self._rays[head_y * env.width + head_x]
+        if hits is None:
+            hits = [None] * 4
+
+        for d in directions:
+            ray = rays[d]
+            hit = None
+            if d < 2:
+                # Columna sin más objetos que la cabeza: solo queda el muro
+                if env.col_count[head_x] > 1:
+                    for y in ray:
+                        valor = board[y][head_x]
+                        if valor:
+                            hit = (valor, abs(y - head_y))
+                            break
+            elif env.row_count[head_y] > 1:
+                row = board[head_y]
+                for x in ray:
+                    valor = row[x]
+                    if valor:
+                        hit = (valor, abs(x - head_x))
+                        break
+            hits[d] = hit or (None, len(ray) + 1)
+
+        return hits
+
+    def _update_hits(self, head, changes):
+        """
+        Actualiza la visión anterior tras un move_snake a partir de las
+        celdas que cambió. El rayo hacia delante solo se acorta en 1 y
+        el de detrás choca con el cuello, salvo que un cambio los afecte;
+        los dos laterales parten de una celda nueva y se recorren otra vez.
+        """
+        old_x, old_y = self._head
+        head_x, head_y = head
+        direction = _MOVE_INDEX.get((head_x - old_x, head_y - old_y))
+        if direction is None:
+            # La cabeza no se movió (choque): el tablero no ha cambiado
+            if not changes:
+                return self._hits
+            return self._ray_cast(head)
+
+        hits = self._hits[:]
+        rescan = [2, 3] if direction < 2 else [0, 1]
+
+        # Delante: el mismo objeto, un paso más cerca, salvo que otro
+        # cambio (cola o manzana nueva) caiga en la misma línea.
+        # changes[0] es la propia cabeza
+        valor, dist = hits[direction]
+        vertical = direction < 2
+        for i in range(1, len(changes)):
+            x, y = changes[i]
+            if (x == head_x) if vertical else (y == head_y):
+                dist = 0
+                break
+        if dist <= 1:
+            rescan.append(direction)
+        else:
+            hits[direction] = (valor, dist - 1)
+
+        # Detrás: el cuello, si la serpiente sigue ocupando la celda
+        back = direction ^ 1
+        if self.env.board[old_y][old_x] == 1:
+            hits[back] = (1, 1)
+        else:
+            rescan.append(back)
+
+        return self._ray_cast(head, hits, rescan)
+
     def _extract_direction_info(self, lines, head_line, head_col, direction):
         """
         Extrae el primer objeto no-vacío en una dirección desde el string
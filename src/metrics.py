@@ -0,0 +1,124 @@
+"""
+Métricas por episodio (-metrics PATH).
+
+MetricsSink guarda un registro por episodio en un archivo JSONL o CSV
+(según la extensión), escribiendo en bloques de flush_every registros,
+y lleva en memoria medias móviles de las últimas window para el
+resumen de consola, que se imprime como mucho cada log_every segundos.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+
+FIELDS = (
+    "mode",
+    "episode",
+    "length",
+    "max_length",
+    "green_apples",
+    "steps",
+    "epsilon",
+    "q_size",
+    "wall_ms",
+    "steps_s",
+)
+# Campos con media móvil
+ROLLING = ("length", "max_length", "green_apples", "steps", "steps_s")
+
+
+class MetricsSink:
+    def __init__(self, path=None, flush_every=100, window=100, log_every=2.0):
+        """Sin path no escribe nada: solo las medias y el ritmo de consola"""
+        self.path = path
+        self.flush_every = flush_every
+        self.log_every = log_every
+        self._buffer = []
+        self._file = None
+        self._csv = None
+        if path is not None:
+            self._file = open(path, "w", newline="")
+            if path.endswith(".csv"):
+                self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+                self._csv.writeheader()
+        self._ventanas = {campo: deque(maxlen=window) for campo in ROLLING}
+        self._sumas = dict.fromkeys(ROLLING, 0)
+        self._ultimo_log = time.perf_counter()
+        self.records = 0
+
+    def record(
+        self,
+        mode,
+        episode,
+        length,
+        max_length,
+        green_apples,
+        steps,
+        epsilon,
+        q_size,
+        wall_s,
+    ):
+        """Registra un episodio (wall_s: segundos que tardó)"""
+        registro = {
+            "mode": mode,
+            "episode": episode,
+            "length": length,
+            "max_length": max_length,
+            "green_apples": green_apples,
+            "steps": steps,
+            "epsilon": round(epsilon, 6),
+            "q_size": q_size,
+            "wall_ms": round(wall_s * 1e3, 3),
+            "steps_s": round(steps / wall_s, 1) if wall_s > 0 else 0.0,
+        }
+        for campo, ventana in self._ventanas.items():
+            valor = registro[campo]
+            if len(ventana) == ventana.maxlen:
+                self._sumas[campo] -= ventana[0]
+            ventana.append(valor)
+            self._sumas[campo] += valor
+        self.records += 1
+        if self._file is not None:
+            self._buffer.append(registro)
+            if len(self._buffer) >= self.flush_every:
+                self.flush()
+
+    def averages(self):
+        """Medias móviles de los últimos episodios"""
+        return {
+            campo: self._sumas[campo] / len(ventana) if ventana else 0.0
+            for campo, ventana in self._ventanas.items()
+        }
+
+    def due(self):
+        """True si han pasado log_every segundos desde el último True"""
+        ahora = time.perf_counter()
+        if ahora - self._ultimo_log < self.log_every:
+            return False
+        self._ultimo_log = ahora
+        return True
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if self._csv is not None:
+            self._csv.writerows(self._buffer)
+        else:
+            self._file.write(
+                "".join(json.dumps(r) + "\n" for r in self._buffer)
+            )
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,230 @@
+"""
+Lectura y escritura de modelos (Q-table + epsilon, alpha y gamma).
+
+Dos formatos, que se distinguen por los primeros bytes del archivo:
+
+- JSON (el de siempre): claves "((cat, cat, cat, cat), 'ACCION')".
+- Binario: cabecera HEADER que empieza por MAGIC, después las celdas
+  (estado codificado * NUM_ACTIONS + accion) como int32 en orden
+  creciente y después sus valores como float32, todo little-endian. Se
+  lee de una vez, sin parsear nada, o se mapea en memoria (map_binary).
+
+En memoria un modelo son dos arrays (celdas, valores) y un dict con los
+parámetros. Uso como conversor:
+
+    python3 -m src.model_file models/100sess.txt [...]
+"""
+
+import argparse
+import ast
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from src.encoding import (
+    decode_action,
+    decode_state,
+    encode_action,
+    encode_state,
+)
+
+MAGIC = b"L2SQ"
+FORMAT_VERSION = 1
+NUM_ACTIONS = 4
+# magic, versión, acciones por estado, número de pares, epsilon, alpha, gamma
+HEADER = struct.Struct("<4sHHIfff")
+PARAMS = ("epsilon", "alpha", "gamma")
+
+
+def is_binary(filepath):
+    """True si el archivo empieza por MAGIC"""
+    if not os.path.isfile(filepath):
+        return False
+    with open(filepath, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def pack_binary(celdas, valores, params, magic=MAGIC):
+    """Bytes del formato binario (cabecera con magic, celdas y valores)"""
+    celdas = np.asarray(celdas, dtype="<i4")
+    # Ordenadas por celda: se pueden buscar sin cargarlas (MappedQTable)
+    orden = np.argsort(celdas, kind="stable")
+    header = HEADER.pack(
+        magic,
+        FORMAT_VERSION,
+        NUM_ACTIONS,
+        len(celdas),
+        *(params[p] for p in PARAMS),
+    )
+    return b"".join(
+        (
+            header,
+            celdas[orden].tobytes(),
+            np.asarray(valores, dtype="<f4")[orden].tobytes(),
+        )
+    )
+
+
+def write_binary(filepath, celdas, valores, params):
+    with open(filepath, "wb") as f:
+        f.write(pack_binary(celdas, valores, params))
+
+
+def _check_binary(filepath, data):
+    """Valida la cabecera de data; devuelve (número de pares, params)"""
+    if len(data) < HEADER.size:
+        raise ValueError(f"{filepath}: archivo binario truncado")
+    magic, version, num_actions, n, *params = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{filepath}: no es un modelo binario")
+    if version != FORMAT_VERSION or num_actions != NUM_ACTIONS:
+        raise ValueError(
+            f"{filepath}: versión {version} con {num_actions} acciones "
+            "no soportada"
+        )
+    if len(data) != HEADER.size + 8 * n:
+        raise ValueError(f"{filepath}: tamaño incorrecto para {n} pares")
+    return n, dict(zip(PARAMS, params))
+
+
+def read_binary(filepath):
+    with open(filepath, "rb") as f:
+        data = f.read()
+    n, params = _check_binary(filepath, data)
+    celdas = np.frombuffer(data, dtype="<i4", count=n, offset=HEADER.size)
+    valores = np.frombuffer(
+        data, dtype="<f4", count=n, offset=HEADER.size + 4 * n
+    )
+    return celdas, valores, params
+
+
+def map_binary(filepath):
+    """
+    Mapea un modelo binario en memoria de solo lectura, sin copiarlo.
+    Devuelve (celdas, valores, params) con celdas y valores como
+    memoryviews de int y float sobre el archivo: los procesos que mapean
+    el mismo archivo comparten sus páginas.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("map_binary necesita una máquina little-endian")
+    with open(filepath, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    n, params = _check_binary(filepath, data)
+    vista = memoryview(data)
+    start = HEADER.size
+    end = start + 4 * n
+    celdas = vista[start:end].cast("i")
+    valores = vista[end:].cast("f")
+    return celdas, valores, params
+
+
+def q_cells(q_table, encoded=True, keys=None):
+    """
+    (celdas, valores) de una Q-table: DenseQTable, o dict con claves
+    (estado, accion) codificadas o legibles según encoded. Con keys, solo
+    esos pares (que tienen que estar en la Q-table).
+    """
+    if keys is None and hasattr(q_table, "cells"):
+        return q_table.cells()
+    items = (
+        q_table.items() if keys is None else ((k, q_table[k]) for k in keys)
+    )
+    celdas, valores = [], []
+    for (estado, accion), valor in items:
+        if not encoded:
+            estado, accion = encode_state(estado), encode_action(accion)
+        celdas.append(estado * NUM_ACTIONS + accion)
+        valores.append(valor)
+    return celdas, valores
+
+
+def load_cells(q_table, celdas, valores, encoded=True):
+    """Al revés que q_cells: sustituye el contenido de q_table"""
+    if hasattr(q_table, "load"):
+        q_table.load(celdas, valores)
+        return
+    q_table.clear()
+    for celda, valor in zip(
+        np.asarray(celdas).tolist(), np.asarray(valores).tolist()
+    ):
+        estado, accion = divmod(celda, NUM_ACTIONS)
+        if not encoded:
+            estado, accion = decode_state(estado), decode_action(accion)
+        q_table[(estado, accion)] = valor
+
+
+def write_json(filepath, celdas, valores, params):
+    """Las claves se guardan en su forma legible"""
+    q_table = {
+        str(
+            (
+                decode_state(celda // NUM_ACTIONS),
+                decode_action(celda % NUM_ACTIONS),
+            )
+        ): valor
+        for celda, valor in zip(
+            np.asarray(celdas).tolist(),
+            np.asarray(valores, dtype=float).tolist(),
+        )
+    }
+    model_data = {"q_table": q_table, **params}
+    with open(filepath, "w") as f:
+        json.dump(model_data, f, indent=2)
+
+
+def read_json(filepath):
+    with open(filepath, "r") as f:
+        model_data = json.load(f)
+    celdas = []
+    for key_str in model_data["q_table"]:
+        # Solo literales: nada de eval
+        estado, accion = ast.literal_eval(key_str)
+        celdas.append(
+            encode_state(estado) * NUM_ACTIONS + encode_action(accion)
+        )
+    celdas = np.array(celdas, dtype=np.int32)
+    valores = np.array(list(model_data["q_table"].values()), dtype=float)
+    params = {p: model_data[p] for p in PARAMS if p in model_data}
+    return celdas, valores, params
+
+
+def read_model(filepath):
+    """(celdas, valores, params) de un modelo en cualquiera de los formatos"""
+    if is_binary(filepath):
+        return read_binary(filepath)
+    return read_json(filepath)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convierte modelos JSON al formato binario"
+    )
+    parser.add_argument("models", nargs="+", help="Modelos JSON (.txt)")
+    parser.add_argument(
+        "-suffix",
+        default=".bin",
+        help="Extensión de los archivos convertidos (default: .bin)",
+    )
+    args = parser.parse_args()
+
+    for model in args.models:
+        path = Path(model)
+        if is_binary(path):
+            print(f"{path}: ya es binario", file=sys.stderr)
+            continue
+        celdas, valores, params = read_json(path)
+        destino = path.with_suffix(args.suffix)
+        write_binary(destino, celdas, valores, params)
+        print(
+            f"{path} ({path.stat().st_size:,} B) -> {destino} "
+            f"({destino.stat().st_size:,} B, {len(celdas)} pares)"
+        )
+
+
+if __name__ == "__main__":
+    main()
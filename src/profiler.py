@@ -0,0 +1,134 @@
+"""
+Tiempos por fase del bucle de entrenamiento (-profile).
+
+Profiler.instrument devuelve un envoltorio del objeto en el que los
+métodos elegidos acumulan tiempo (time.perf_counter_ns) y llamadas en
+su fase; el resto de atributos se leen del objeto original. Sin
+-profile no se envuelve nada, así que no cuesta nada.
+"""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Métodos de cada objeto que usa run_episode, medidos como fases
+AGENT_PHASES = (
+    "seleccionar_accion",
+    "update_q_value",
+    "replay_experiences",
+    "decay_epsilon",
+)
+BOARD_PHASES = ("reset", "move_snake", "get_length")
+INTERPRETER_PHASES = ("get_compressed_state",)
+DISPLAY_PHASES = ("draw_board",)
+
+
+class _Instrumentado:
+    """Envoltorio con los métodos medidos; lo demás es del original"""
+
+    def __init__(self, obj, medidos):
+        self._obj = obj
+        vars(self).update(medidos)
+
+    def __getattr__(self, nombre):
+        return getattr(self._obj, nombre)
+
+
+class Profiler:
+    """
+    Acumula (ns, llamadas) por fase. Las fases de los métodos van dentro
+    de la fase "episode" (el tiempo total de run_episode); la diferencia
+    es el propio bucle. Otras fases (guardar, checkpoints) van aparte.
+    """
+
+    def __init__(self, total="episode"):
+        self.total = total
+        self.fases = {}  # nombre -> [ns, llamadas]
+        self.internas = []  # fases medidas dentro de total
+
+    def _acumulador(self, fase):
+        return self.fases.setdefault(fase, [0, 0])
+
+    def medir(self, fase, funcion):
+        """funcion envuelta para acumular su tiempo en fase"""
+        acumulado = self._acumulador(fase)
+        clock = time.perf_counter_ns
+
+        def medida(*args, **kwargs):
+            t0 = clock()
+            resultado = funcion(*args, **kwargs)
+            acumulado[0] += clock() - t0
+            acumulado[1] += 1
+            return resultado
+
+        return medida
+
+    def instrument(self, obj, metodos):
+        """Envoltorio de obj con sus metodos medidos (fases internas)"""
+        medidos = {}
+        for metodo in metodos:
+            medidos[metodo] = self.medir(metodo, getattr(obj, metodo))
+            if metodo not in self.internas:
+                self.internas.append(metodo)
+        return _Instrumentado(obj, medidos)
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide un bloque de código"""
+        acumulado = self._acumulador(nombre)
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            acumulado[0] += time.perf_counter_ns() - t0
+            acumulado[1] += 1
+
+    def to_dict(self):
+        """{fase: {ns, llamadas, ns_por_llamada, pct}}, con el resto"""
+        fases = {nombre: list(v) for nombre, v in self.fases.items()}
+        total_ns = fases.get(self.total, [0, 0])[0]
+        if total_ns:
+            internas = sum(fases[f][0] for f in self.internas if f in fases)
+            fases["resto del bucle"] = [max(total_ns - internas, 0), 0]
+        resultado = {}
+        for nombre, (ns, llamadas) in fases.items():
+            interna = nombre in self.internas or nombre == "resto del bucle"
+            resultado[nombre] = {
+                "ns": ns,
+                "llamadas": llamadas,
+                "ns_por_llamada": ns / llamadas if llamadas else None,
+                # Porcentaje del episodio (solo las fases internas)
+                "pct": ns / total_ns * 100 if interna and total_ns else None,
+            }
+        return resultado
+
+    def report(self):
+        """Tabla de las fases, las internas ordenadas por tiempo"""
+        datos = self.to_dict()
+        lineas = [
+            f"{'fase':>22} | {'llamadas':>9} | {'total ms':>9} | "
+            f"{'ns/llamada':>10} | {'%':>5}"
+        ]
+        orden = sorted(
+            datos, key=lambda f: (datos[f]["pct"] is None, -datos[f]["ns"])
+        )
+        for nombre in orden:
+            d = datos[nombre]
+            por_llamada = (
+                f"{d['ns_por_llamada']:10,.0f}" if d["llamadas"] else " " * 10
+            )
+            pct = f"{d['pct']:5.1f}" if d["pct"] is not None else " " * 5
+            lineas.append(
+                f"{nombre:>22} | {d['llamadas'] or '':>9} | "
+                f"{d['ns'] / 1e6:9,.1f} | {por_llamada} | {pct}"
+            )
+        return "\n".join(lineas)
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def fase(profiler, nombre):
+    """profiler.fase(nombre), o un bloque sin medir si no hay profiler"""
+    return nullcontext() if profiler is None else profiler.fase(nombre)
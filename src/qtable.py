@@ -0,0 +1,297 @@
+import os
+import random
+import weakref
+from bisect import bisect_left
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.encoding import NUM_STATES
+from src.model_file import NUM_ACTIONS, map_binary
+
+
+class DenseQTable:
+    """
+    Q-table en un array float32 [NUM_STATES, 4] indexado por el estado
+    codificado (src/encoding.py) y la acción 0-3.
+
+    Se usa como el dict de Agent: claves (estado, accion), get(), len(),
+    items() y clear(). Solo cuentan como entradas los pares actualizados
+    alguna vez, igual que las claves del dict; visits guarda cuántas
+    veces se actualizó cada par.
+    """
+
+    def __init__(self, num_states=NUM_STATES, num_actions=4, buffer=None):
+        """
+        Con buffer (p. ej. memoria compartida) los arrays se crean sobre
+        él en vez de reservar memoria nueva: valores y después visitas.
+        """
+        self.num_actions = num_actions
+        shape = (num_states, num_actions)
+        if buffer is None:
+            self.values = np.zeros(shape, dtype=np.float32)
+            self.visits = np.zeros(shape, dtype=np.uint32)
+        else:
+            self.values = np.ndarray(shape, dtype=np.float32, buffer=buffer)
+            self.visits = np.ndarray(
+                shape,
+                dtype=np.uint32,
+                buffer=buffer,
+                offset=self.values.nbytes,
+            )
+        # Vistas planas (estado * num_actions + accion) sobre los mismos
+        # arrays: el acceso a un solo valor desde Python no pasa por NumPy
+        self._q = memoryview(self.values).cast("B").cast("f")
+        self._n = memoryview(self.visits).cast("B").cast("I")
+
+    def __len__(self):
+        return int(np.count_nonzero(self.visits))
+
+    def __contains__(self, key):
+        estado, accion = key
+        return self._n[estado * self.num_actions + accion] > 0
+
+    def __getitem__(self, key):
+        estado, accion = key
+        i = estado * self.num_actions + accion
+        if not self._n[i]:
+            raise KeyError(key)
+        return self._q[i]
+
+    def __setitem__(self, key, value):
+        estado, accion = key
+        i = estado * self.num_actions + accion
+        self._q[i] = value
+        if not self._n[i]:
+            self._n[i] = 1
+
+    def get(self, key, default=None):
+        estado, accion = key
+        i = estado * self.num_actions + accion
+        if not self._n[i]:
+            return default
+        return self._q[i]
+
+    def items(self):
+        for estado, accion in zip(*np.nonzero(self.visits)):
+            key = (int(estado), int(accion))
+            yield key, float(self.values[key])
+
+    def clear(self):
+        self.values.fill(0)
+        self.visits.fill(0)
+
+    def cells(self):
+        """
+        (celdas, valores) de los pares visitados, con celda = estado *
+        num_actions + accion
+        """
+        celdas = np.flatnonzero(self.visits)
+        return celdas, self.values.reshape(-1)[celdas]
+
+    def load(self, celdas, valores):
+        """Sustituye el contenido por estos pares, con una visita cada uno"""
+        self.clear()
+        self.values.reshape(-1)[celdas] = valores
+        self.visits.reshape(-1)[celdas] = 1
+
+    def mejor_accion(self, estado, acciones):
+        """
+        Acción de mayor Q entre acciones (enteros), desempatando al azar.
+        Los pares sin visitar valen 0, como en el dict.
+        """
+        q = self._q
+        base = estado * self.num_actions
+        max_q = None
+        for accion in acciones:
+            valor = q[base + accion]
+            if max_q is None or valor > max_q:
+                max_q = valor
+                mejor = accion
+                empates = 1
+            elif valor == max_q:
+                empates += 1
+
+        if empates > 1:
+            k = random.randrange(empates)
+            for accion in acciones:
+                if q[base + accion] == max_q:
+                    if not k:
+                        return accion
+                    k -= 1
+        return mejor
+
+    def update(
+        self, estado, accion, recompensa, siguiente_estado, alpha, gamma
+    ):
+        """
+        Ecuación de Bellman (siguiente_estado None = estado final).
+        Devuelve el error TD antes de actualizar.
+        """
+        q = self._q
+        num_actions = self.num_actions
+        if siguiente_estado is None:
+            q_target = recompensa
+        else:
+            base = siguiente_estado * num_actions
+            end = base + num_actions
+            fila = q[base:end]
+            q_target = recompensa + gamma * max(fila)
+        i = estado * num_actions + accion
+        error = q_target - q[i]
+        q[i] += alpha * error
+        self._n[i] += 1
+        return error
+
+    def update_batch(
+        self, estados, acciones, recompensas, siguientes, dones, alpha, gamma
+    ):
+        """
+        Bellman para un lote de transiciones a la vez. Todos los objetivos
+        se calculan con la Q de antes del lote, y si un par (estado,
+        accion) se repite, se aplica la media de sus errores TD: el
+        resultado no depende del orden del lote.
+        """
+        values = self.values
+        estados = np.asarray(estados, dtype=np.int64)
+        acciones = np.asarray(acciones, dtype=np.int64)
+        recompensas = np.asarray(recompensas, dtype=np.float32)
+        dones = np.asarray(dones, dtype=bool)
+        # Los siguientes de las transiciones finales se ignoran (pueden
+        # venir como None)
+        siguientes = np.where(dones, 0, siguientes).astype(np.int64)
+
+        q_next = values[siguientes].max(axis=1)
+        q_next[dones] = 0
+        celdas = estados * self.num_actions + acciones
+        flat = values.reshape(-1)
+        td = recompensas + gamma * q_next - flat[celdas]
+
+        celdas, inverse, counts = np.unique(
+            celdas, return_inverse=True, return_counts=True
+        )
+        flat[celdas] += alpha * np.bincount(inverse, weights=td) / counts
+        self.visits.reshape(-1)[celdas] += counts.astype(np.uint32)
+
+
+class SharedQTable(DenseQTable):
+    """
+    DenseQTable en un bloque de multiprocessing.shared_memory. Varios
+    procesos que abran el mismo bloque (por su name) leen y actualizan
+    los mismos valores sin locks, al estilo Hogwild: una actualización
+    concurrente del mismo par puede perderse, pero son pocas frente al
+    total.
+
+    Sin name se crea un bloque nuevo a ceros, que se borra del sistema
+    cuando este objeto desaparece o termina el programa.
+    """
+
+    def __init__(self, name=None, num_states=NUM_STATES, num_actions=4):
+        nbytes = num_states * num_actions * 8  # float32 + uint32
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            weakref.finalize(self, _unlink, self.shm, os.getpid())
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        super().__init__(num_states, num_actions, buffer=self.shm.buf)
+        if name is None:
+            self.clear()
+
+    @property
+    def name(self):
+        return self.shm.name
+
+
+def _unlink(shm, pid):
+    """Borra el bloque, solo desde el proceso que lo creó (no tras fork)"""
+    if os.getpid() == pid:
+        shm.unlink()
+
+
+class MappedQTable:
+    """
+    Q-table de solo lectura sobre un modelo binario mapeado en memoria
+    (src/model_file.py): no carga nada al crearse, así que arranca en el
+    mismo tiempo sea cual sea el modelo, y varios procesos que usen el
+    mismo archivo comparten una sola copia en la caché de páginas.
+
+    Tiene la parte de lectura de DenseQTable (get, len, items,
+    mejor_accion...). Cada búsqueda es una bisección sobre las celdas
+    ordenadas del archivo.
+    """
+
+    num_actions = NUM_ACTIONS
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._c, self._q, self.params = map_binary(filepath)
+
+    def _find(self, i):
+        """Posición de la celda i en el archivo, o -1"""
+        c = self._c
+        j = bisect_left(c, i)
+        if j < len(c) and c[j] == i:
+            return j
+        return -1
+
+    def __len__(self):
+        return len(self._c)
+
+    def __contains__(self, key):
+        estado, accion = key
+        return self._find(estado * NUM_ACTIONS + accion) >= 0
+
+    def __getitem__(self, key):
+        estado, accion = key
+        j = self._find(estado * NUM_ACTIONS + accion)
+        if j < 0:
+            raise KeyError(key)
+        return self._q[j]
+
+    def get(self, key, default=None):
+        estado, accion = key
+        j = self._find(estado * NUM_ACTIONS + accion)
+        if j < 0:
+            return default
+        return self._q[j]
+
+    def items(self):
+        for celda, valor in zip(self._c, self._q):
+            yield divmod(celda, NUM_ACTIONS), valor
+
+    def mejor_accion(self, estado, acciones):
+        """Como DenseQTable.mejor_accion (los pares que faltan valen 0)"""
+        # Las celdas de un estado están seguidas: una sola bisección
+        c = self._c
+        base = estado * NUM_ACTIONS
+        j = bisect_left(c, base)
+        end = base + NUM_ACTIONS
+        fila = [0, 0, 0, 0]
+        n = len(c)
+        while j < n and c[j] < end:
+            fila[c[j] - base] = self._q[j]
+            j += 1
+
+        max_q = None
+        for accion in acciones:
+            valor = fila[accion]
+            if max_q is None or valor > max_q:
+                max_q = valor
+                mejor = accion
+                empates = 1
+            elif valor == max_q:
+                empates += 1
+
+        if empates > 1:
+            k = random.randrange(empates)
+            for accion in acciones:
+                if fila[accion] == max_q:
+                    if not k:
+                        return accion
+                    k -= 1
+        return mejor
+
+    def _solo_lectura(self, *args, **kwargs):
+        raise TypeError(f"{self.filepath} está mapeado en solo lectura")
+
+    __setitem__ = update = update_batch = clear = load = _solo_lectura
@@ -0,0 +1,113 @@
+import random
+
+
+class SumTree:
+    """
+    Árbol binario de sumas sobre capacity hojas (una prioridad por hoja).
+    Cambiar una prioridad y buscar la hoja de una suma acumulada cuestan
+    O(log n).
+    """
+
+    __slots__ = ("size", "tree")
+
+    def __init__(self, capacity):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.size = size
+        # tree[1] es la raíz; las hojas van de size a 2 * size - 1
+        self.tree = [0.0] * (2 * size)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, i):
+        return self.tree[self.size + i]
+
+    def update(self, i, priority):
+        tree = self.tree
+        j = self.size + i
+        tree[j] = priority
+        j //= 2
+        while j:
+            tree[j] = tree[2 * j] + tree[2 * j + 1]
+            j //= 2
+
+    def find(self, value):
+        """Hoja cuya suma acumulada contiene value (0 <= value < total)"""
+        tree = self.tree
+        size = self.size
+        j = 1
+        while j < size:
+            j *= 2
+            if value >= tree[j]:
+                value -= tree[j]
+                j += 1
+        return j - size
+
+
+class ReplayMemory:
+    """
+    Memoria de experiencias en un ring buffer de capacidad fija: añadir
+    es O(1) y, al llenarse, cada nueva sustituye a la más antigua.
+
+    Con prioritized=True el muestreo es proporcional a prioridad**alpha
+    (SumTree, O(log n) por muestra); las nuevas entran con la prioridad
+    máxima vista hasta ahora para que se repitan al menos una vez.
+    """
+
+    def __init__(
+        self, capacity=100000, prioritized=True, alpha=0.6, rng=random
+    ):
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.rng = rng
+        self.data = [None] * capacity
+        self.next = 0
+        self.size = 0
+        self.max_priority = 1.0
+        if prioritized:
+            self.tree = SumTree(capacity)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, transition):
+        i = self.next
+        self.data[i] = transition
+        if self.prioritized:
+            self.tree.update(i, self.max_priority**self.alpha)
+        self.next = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def sample(self, k):
+        """
+        Devuelve (índices, transiciones) de k muestras con reemplazo. Los
+        índices sirven para update_priorities.
+        """
+        if not self.size:
+            return [], []
+        if not self.prioritized:
+            indices = [self.rng.randrange(self.size) for _ in range(k)]
+        else:
+            # Muestreo estratificado: una muestra por tramo de la suma
+            tree = self.tree
+            segment = tree.total() / k
+            indices = []
+            for n in range(k):
+                value = (n + self.rng.random()) * segment
+                # El redondeo puede dejar value en el borde del árbol
+                indices.append(min(tree.find(value), self.size - 1))
+        return indices, [self.data[i] for i in indices]
+
+    def update_priorities(self, indices, errores, eps=1e-3):
+        """Prioridad = |error TD| + eps de cada índice muestreado"""
+        if not self.prioritized:
+            return
+        for i, error in zip(indices, errores):
+            priority = abs(error) + eps
+            if priority > self.max_priority:
+                self.max_priority = priority
+            self.tree.update(i, priority**self.alpha)
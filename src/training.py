@@ -0,0 +1,467 @@
+import multiprocessing as mp
+import queue
+import random
+
+import numpy as np
+
+from src.agent import Agent
+from src.bitboard import BitBoard
+from src.environment import Board
+from src.interpreter import Interpreter
+from src.qtable import SharedQTable
+
+# Implementaciones del tablero con la misma API pública
+BACKENDS = {"grid": Board, "bitboard": BitBoard}
+
+# Cómo se combinan las Q-tables de los workers en cada sincronización
+MERGES = ("visits", "mean")
+
+
+def run_episode(
+    agent,
+    board,
+    interpreter,
+    max_steps=1000,
+    display=None,
+    episode=0,
+    on_transition=None,
+):
+    """
+    Juega y aprende una partida completa desde board.reset(), con replay y
+    decaimiento de epsilon al final. Con display, dibuja el tablero antes
+    de cada paso.
+
+    Con on_transition, cada transición (estado, accion, recompensa,
+    siguiente_estado) se le pasa en vez de aprenderla, y no hay replay:
+    el agente solo juega (actores de src/actor_learner.py).
+
+    Devuelve (manzanas verdes, pasos, longitud máxima).
+    """
+    board.reset()
+    estado = interpreter.get_compressed_state()
+    game_over = False
+    steps = 0
+    max_length = 0
+    green_apples_eaten = 0
+
+    while not game_over:
+        # Mostrar estado visual
+        if display is not None:
+            display.draw_board(board, episode + 1, steps)
+
+        # Agent elige acción
+        accion = agent.seleccionar_accion(estado)
+
+        # Environment ejecuta acción
+        recompensa, game_over = board.move_snake(accion)
+
+        # Contar manzanas verdes
+        if recompensa == 10:
+            green_apples_eaten += 1
+
+        # Obtener siguiente estado
+        if game_over:
+            siguiente_estado = None
+        else:
+            siguiente_estado = interpreter.get_compressed_state()
+
+        # Agent aprende
+        if on_transition is None:
+            agent.update_q_value(estado, accion, recompensa, siguiente_estado)
+        else:
+            on_transition(estado, accion, recompensa, siguiente_estado)
+
+        # Actualizar estado para siguiente iteración
+        estado = (
+            siguiente_estado
+            if siguiente_estado is not None
+            else interpreter.get_compressed_state()
+        )
+
+        steps += 1
+        max_length = max(max_length, board.get_length())
+
+        # Límite de pasos por episodio
+        if steps > max_steps:
+            game_over = True
+
+    # Replay de experiencias exitosas
+    if on_transition is None:
+        agent.replay_experiences(num_replays=10)
+
+    # Reducir epsilon después de cada episodio
+    agent.decay_epsilon()
+
+    return green_apples_eaten, steps, max_length
+
+
+def test_episode(
+    agent, board, interpreter, max_steps=5000, display=None, episode=0
+):
+    """
+    Juega una partida sin aprender desde board.reset(). Con display,
+    dibuja el tablero antes de cada paso.
+
+    Devuelve (longitud final, longitud máxima, manzanas verdes, pasos).
+    """
+    board.reset()
+    estado = interpreter.get_compressed_state()
+    game_over = False
+    steps = 0
+    green_apples = 0
+    max_length = 3
+
+    while not game_over:
+        if display is not None:
+            display.draw_board(board, episode + 1, steps)
+
+        accion = agent.seleccionar_accion(estado)
+        recompensa, game_over = board.move_snake(accion)
+
+        if recompensa == 10:
+            green_apples += 1
+
+        if not game_over:
+            estado = interpreter.get_compressed_state()
+
+        steps += 1
+        max_length = max(max_length, board.get_length())
+
+        if steps > max_steps:
+            game_over = True
+
+    return board.get_length(), max_length, green_apples, steps
+
+
+def worker_seed(seed, worker_id):
+    """Semilla de cada worker (None: aleatoria)"""
+    return None if seed is None else seed * 1000 + worker_id
+
+
+def worker_config(
+    agent, seed, backend, width, height, green_apples, red_apples
+):
+    """Todo lo que necesita un worker para crear su partida y su Agent"""
+    return {
+        "seed": seed,
+        "backend": backend,
+        "width": width,
+        "height": height,
+        "green_apples": green_apples,
+        "red_apples": red_apples,
+        "encoded": agent.encoded,
+        "q_backend": "dense" if agent.dense else "dict",
+        "shared_name": None,
+        "replay_capacity": agent.replay_buffer.capacity,
+        "replay_min_reward": agent.replay_min_reward,
+        "epsilon": agent.epsilon,
+        "alpha": agent.alpha,
+        "gamma": agent.gamma,
+    }
+
+
+def crear_worker(worker_id, config):
+    """(agent, board, interpreter) de un worker, con su semilla"""
+    seed = worker_seed(config["seed"], worker_id)
+    # Tras un fork el generador global es una copia del padre
+    random.seed(seed)
+    board = BACKENDS[config["backend"]](
+        config["width"],
+        config["height"],
+        config["green_apples"],
+        config["red_apples"],
+        seed=seed,
+    )
+    agent = Agent(
+        encoded=config["encoded"],
+        q_backend=config["q_backend"],
+        replay_capacity=config["replay_capacity"],
+        replay_min_reward=config["replay_min_reward"],
+        shared_name=config["shared_name"],
+    )
+    agent.epsilon = config["epsilon"]
+    agent.alpha = config["alpha"]
+    agent.gamma = config["gamma"]
+    interpreter = Interpreter(board, encoded=agent.encoded)
+    return agent, board, interpreter
+
+
+def _worker(conn, worker_id, config):
+    """
+    Proceso de un worker: recibe la Q-table común y cuántos episodios
+    jugar, y devuelve su Q-table, las visitas hechas desde la última
+    sincronización, las estadísticas de cada episodio y su epsilon.
+    None termina el proceso.
+    """
+    agent, board, interpreter = crear_worker(worker_id, config)
+    # merge_tablas pondera por las visitas de cada worker
+    agent.count_visits = True
+
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        tabla, num_episodes = msg
+        _cargar_tabla(agent, tabla)
+        stats = [
+            run_episode(agent, board, interpreter) for _ in range(num_episodes)
+        ]
+        conn.send((_exportar_tabla(agent), stats, agent.epsilon))
+    conn.close()
+
+
+def repartir_episodios(num_episodes, num_workers):
+    """Episodios de cada worker, lo más igualados posible"""
+    return [
+        num_episodes // num_workers + (i < num_episodes % num_workers)
+        for i in range(num_workers)
+    ]
+
+
+def _exportar_tabla(agent):
+    """(valores, visitas) de la Q-table, para enviar a otro proceso"""
+    if agent.dense:
+        return agent.q_table.values, agent.q_table.visits
+    return agent.q_table, agent.visitas
+
+
+def _cargar_tabla(agent, tabla):
+    """Sustituye la Q-table del worker y pone a cero sus visitas"""
+    valores, _ = tabla
+    if agent.dense:
+        agent.q_table.values[:] = valores
+        agent.q_table.visits.fill(0)
+    else:
+        agent.q_table = dict(valores)
+        agent.visitas = {}
+
+
+def merge_tablas(agent, tablas, merge="visits"):
+    """
+    Combina en agent las Q-tables de los workers, que partían todas de la
+    de agent. Con merge="visits" cada valor es la media ponderada por las
+    visitas de cada worker desde la última sincronización (los pares que
+    nadie visitó no cambian); con "mean", la media simple. Las visitas de
+    los workers se suman a las de agent.
+    """
+    if agent.dense:
+        valores = np.stack([v for v, _ in tablas])
+        visitas = np.stack([n for _, n in tablas]).astype(np.float64)
+        total = visitas.sum(axis=0)
+        q_table = agent.q_table
+        if merge == "visits":
+            ponderado = (valores * visitas).sum(axis=0)
+            q_table.values[:] = np.where(
+                total > 0, ponderado / np.maximum(total, 1), q_table.values
+            )
+        else:
+            q_table.values[:] = valores.mean(axis=0)
+        q_table.visits += total.astype(np.uint32)
+        return
+
+    # Claves en orden de aparición: el resultado no depende del hash
+    claves = dict.fromkeys(k for valores, _ in tablas for k in valores)
+    for key in claves:
+        total = sum(visitas.get(key, 0) for _, visitas in tablas)
+        if merge == "visits":
+            if total:
+                agent.q_table[key] = (
+                    sum(
+                        visitas.get(key, 0) * valores.get(key, 0)
+                        for valores, visitas in tablas
+                    )
+                    / total
+                )
+        else:
+            agent.q_table[key] = sum(
+                valores.get(key, 0) for valores, _ in tablas
+            ) / len(tablas)
+        if total:
+            agent.visitas[key] = agent.visitas.get(key, 0) + total
+
+
+def train_parallel(
+    agent,
+    num_workers,
+    num_episodes=10,
+    sync_every=10,
+    merge="visits",
+    seed=None,
+    verbose=True,
+    backend="grid",
+    width=10,
+    height=10,
+    green_apples=2,
+    red_apples=1,
+):
+    """
+    Entrenamiento con num_workers procesos, cada uno con su Board,
+    Interpreter y Agent. Cada sync_every episodios por worker, las
+    Q-tables se combinan en agent (merge_tablas) y se reparten otra vez.
+
+    Con seed, cada worker usa worker_seed(seed, i) para su tablero y su
+    exploración: dos ejecuciones iguales dan la misma Q-table.
+
+    Cada worker reduce su propio epsilon; agent se queda con el menor de
+    los últimos que ha enviado cada uno (el del que más episodios lleva).
+
+    Devuelve las estadísticas de cada episodio jugado, como run_episode.
+    """
+    if merge not in MERGES:
+        raise ValueError(f"Merge desconocido: {merge}")
+    config = worker_config(
+        agent, seed, backend, width, height, green_apples, red_apples
+    )
+
+    # Episodios que le tocan a cada worker
+    pendientes = repartir_episodios(num_episodes, num_workers)
+
+    conns = []
+    procesos = []
+    for i in range(num_workers):
+        parent, child = mp.Pipe()
+        proceso = mp.Process(target=_worker, args=(child, i, config))
+        proceso.start()
+        child.close()
+        conns.append(parent)
+        procesos.append(proceso)
+
+    total_green_apples = 0
+    best_length = 0
+    todos = []
+    epsilons = {}  # último epsilon de cada worker
+    try:
+        while any(pendientes):
+            tabla = _exportar_tabla(agent)
+            ronda = [min(sync_every, p) for p in pendientes]
+            # Solo los workers a los que aún les quedan episodios
+            activos = [i for i, n in enumerate(ronda) if n]
+            for conn, n in zip(conns, ronda):
+                if n:
+                    conn.send((tabla, n))
+            try:
+                resultados = [conns[i].recv() for i in activos]
+            except EOFError:
+                raise RuntimeError("Un worker terminó sin avisar") from None
+            pendientes = [p - n for p, n in zip(pendientes, ronda)]
+
+            merge_tablas(agent, [r[0] for r in resultados], merge)
+            for i, r in zip(activos, resultados):
+                epsilons[i] = r[2]
+            agent.epsilon = min(epsilons.values())
+
+            stats = [s for r in resultados for s in r[1]]
+            todos.extend(stats)
+            total_green_apples += sum(s[0] for s in stats)
+            best_length = max([best_length] + [s[2] for s in stats])
+            if verbose:
+                print(
+                    f"Episodes {len(todos)}/{num_episodes} | "
+                    f"Workers: {num_workers} | "
+                    f"Green apples: {sum(s[0] for s in stats)} | "
+                    f"Best length: {best_length} | "
+                    f"Epsilon: {agent.epsilon:.3f} | "
+                    f"Q-table size: {len(agent.q_table)}"
+                )
+    finally:
+        for conn, proceso in zip(conns, procesos):
+            try:
+                conn.send(None)
+            except (BrokenPipeError, ConnectionResetError):
+                # El worker ya terminó (normalmente por un error)
+                proceso.terminate()
+        for proceso in procesos:
+            proceso.join()
+
+    print("\nEntrenamiento completado. Q-table final: ")
+    print(f"{len(agent.q_table)} estados")
+    print(f"Total green apples eaten: {total_green_apples}/{num_episodes}")
+    print(f"Best length achieved: {best_length}")
+
+    return todos
+
+
+def _hogwild_worker(cola, worker_id, num_episodes, config):
+    """Juega sus episodios sobre la Q-table compartida y envía sus stats"""
+    agent, board, interpreter = crear_worker(worker_id, config)
+    stats = [
+        run_episode(agent, board, interpreter) for _ in range(num_episodes)
+    ]
+    cola.put((worker_id, stats, agent.epsilon))
+
+
+def train_hogwild(
+    agent,
+    num_workers,
+    num_episodes=10,
+    seed=None,
+    verbose=True,
+    backend="grid",
+    width=10,
+    height=10,
+    green_apples=2,
+    red_apples=1,
+):
+    """
+    Entrenamiento con num_workers procesos que leen y actualizan a la vez,
+    sin locks, la Q-table compartida de agent (Agent(q_backend="shared")).
+    No hay sincronizaciones: cada actualización la ven enseguida los demás.
+
+    Las semillas son las de train_parallel, pero el orden en que se
+    mezclan las actualizaciones depende del reparto de la CPU, así que
+    el resultado no es reproducible con más de un worker.
+
+    Devuelve las estadísticas de cada episodio jugado, como run_episode.
+    """
+    if not isinstance(agent.q_table, SharedQTable):
+        raise ValueError("train_hogwild necesita Agent(q_backend='shared')")
+    config = worker_config(
+        agent, seed, backend, width, height, green_apples, red_apples
+    )
+    config["q_backend"] = "shared"
+    config["shared_name"] = agent.q_table.name
+
+    cola = mp.Queue()
+    procesos = [
+        mp.Process(target=_hogwild_worker, args=(cola, i, n, config))
+        for i, n in enumerate(repartir_episodios(num_episodes, num_workers))
+    ]
+    for proceso in procesos:
+        proceso.start()
+    resultados = []
+    try:
+        while len(resultados) < num_workers:
+            try:
+                resultados.append(cola.get(timeout=1.0))
+            except queue.Empty:
+                # Un worker que falla (exitcode != 0) no enviará nada
+                if any(proceso.exitcode for proceso in procesos):
+                    raise RuntimeError("Un worker terminó con un error")
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive() and len(resultados) < num_workers:
+                proceso.terminate()
+            proceso.join()
+    resultados.sort()
+
+    # El menor epsilon: el del worker que más episodios ha jugado
+    agent.epsilon = min(epsilon for _, _, epsilon in resultados)
+    todos = [s for _, stats, _ in resultados for s in stats]
+    if verbose:
+        for worker_id, stats, epsilon in resultados:
+            print(
+                f"Worker {worker_id} | Episodes: {len(stats)} | "
+                f"Green apples: {sum(s[0] for s in stats)} | "
+                f"Best length: {max((s[2] for s in stats), default=0)} | "
+                f"Epsilon: {epsilon:.3f}"
+            )
+
+    print("\nEntrenamiento completado. Q-table final: ")
+    print(f"{len(agent.q_table)} estados")
+    print(
+        f"Total green apples eaten: {sum(s[0] for s in todos)}/"
+        f"{num_episodes}"
+    )
+    print(f"Best length achieved: {max((s[2] for s in todos), default=0)}")
+
+    return todos
@@ -0,0 +1,237 @@
+import numpy as np
+
+# Mismos códigos de celda que Board
+EMPTY = 0
+SNAKE = 1
+GREEN = 2
+RED = 3
+
+# Acciones como enteros: 0=UP, 1=DOWN, 2=LEFT, 3=RIGHT
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+ACTION_DX = np.array([0, 0, -1, 1], dtype=np.int64)
+ACTION_DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+
+
+class VecBoard:
+    """
+    N partidas de Snake simuladas a la vez sobre arrays de NumPy.
+
+    Cada llamada a step() avanza todas las partidas con las mismas reglas
+    y recompensas que Board.move_snake. Las partidas que terminan se
+    reinician automáticamente dentro del mismo step().
+    """
+
+    def __init__(
+        self,
+        num_envs=256,
+        width=10,
+        height=10,
+        green_apples=2,
+        red_apples=1,
+        seed=None,
+    ):
+        if max(width, height) < 4:
+            raise ValueError("El tablero necesita un lado de al menos 4")
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.num_green = green_apples
+        self.num_red = red_apples
+        self.num_cells = width * height
+        self.rng = np.random.default_rng(seed)
+
+        n = num_envs
+        # Tablero aplanado: celda = y * width + x
+        self.grid = np.zeros((n, self.num_cells), dtype=np.int8)
+        # Cuerpo como ring buffer de celdas; head_ptr apunta a la cabeza
+        self.body = np.zeros((n, self.num_cells), dtype=np.int64)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.segments = np.zeros(n, dtype=np.int64)
+        self.heads = np.zeros(n, dtype=np.int64)
+        self.lengths = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        # Posiciones de las manzanas verdes (-1 si no caben en el tablero)
+        self.green = np.full((n, green_apples), -1, dtype=np.int64)
+
+        self._rows = np.arange(n)
+        # Offset de cada partida en las vistas aplanadas
+        self._base = self._rows * self.num_cells
+        self._grid_flat = self.grid.reshape(-1)
+        self._body_flat = self.body.reshape(-1)
+
+        # Tablas por celda: vecino en cada acción (-1 = muro) y coordenadas
+        cell = np.arange(self.num_cells)
+        self._cell_x = cell % width
+        self._cell_y = cell // width
+        nx = self._cell_x[:, None] + ACTION_DX[None, :]
+        ny = self._cell_y[:, None] + ACTION_DY[None, :]
+        inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        self._next_cell = np.where(inside, ny * width + nx, -1)
+
+        # Primera dirección (UP, DOWN, LEFT, RIGHT) con sitio para 3
+        # segmentos desde cada celda, igual que Board.reset
+        fx = self._cell_x[:, None] + 2 * ACTION_DX[None, :]
+        fy = self._cell_y[:, None] + 2 * ACTION_DY[None, :]
+        fits = (fx >= 0) & (fx < width) & (fy >= 0) & (fy < height)
+        self._start_action = fits.argmax(axis=1)
+
+        # Bonus de proximidad indexado por distancia Manhattan; el último
+        # valor (sin bonus) cubre el caso de no haber manzanas verdes
+        dist = np.arange(width + height + 1)
+        self._bonus = np.where(dist <= 2, 0.5, np.where(dist <= 4, 0.2, 0))
+        self._no_green = width + height
+
+        self.reset()
+
+    @property
+    def boards(self):
+        """Vista [N, height, width] del tablero (mismo layout que Board)"""
+        return self.grid.reshape(self.num_envs, self.height, self.width)
+
+    def reset(self, rows=None):
+        """Reinicia las partidas indicadas (todas si rows es None)"""
+        if rows is None:
+            rows = self._rows
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+
+        self.grid[rows] = EMPTY
+        base = self._base[rows]
+        tail = (self.rng.random(rows.size) * self.num_cells).astype(np.int64)
+        action = self._start_action[tail]
+        mid = self._next_cell[tail, action]
+        head = self._next_cell[mid, action]
+
+        body = self._body_flat
+        body[base] = tail
+        body[base + 1] = mid
+        body[base + 2] = head
+        grid = self._grid_flat
+        grid[base + tail] = SNAKE
+        grid[base + mid] = SNAKE
+        grid[base + head] = SNAKE
+        self.head_ptr[rows] = 2
+        self.segments[rows] = 3
+        self.heads[rows] = head
+        self.lengths[rows] = 3
+        self.done[rows] = False
+
+        for i in range(self.num_green):
+            self.green[rows, i] = self._spawn(rows, GREEN)
+        for _ in range(self.num_red):
+            self._spawn(rows, RED)
+
+    def step(self, actions):
+        """
+        Aplica una acción (0-3) a cada partida.
+        Devuelve (rewards, dones); las partidas con done=True ya han sido
+        reiniciadas al volver.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+
+        # Fuera del tablero (-1) cuenta como chocar
+        new_cell = self._next_cell[self.heads, actions]
+        val = self._grid_flat[self._base + new_cell]
+        val[new_cell < 0] = SNAKE
+        dead = val == SNAKE
+
+        # Mover la cabeza en todas las partidas vivas
+        alive = np.flatnonzero(~dead)
+        cells = new_cell[alive]
+        ptr = self.head_ptr[alive] + 1
+        ptr[ptr == self.num_cells] = 0
+        self._body_flat[self._base[alive] + ptr] = cells
+        self.head_ptr[alive] = ptr
+        self.segments[alive] += 1
+        self.heads[alive] = cells
+        self._grid_flat[self._base[alive] + cells] = SNAKE
+        val_alive = val[alive]
+
+        # Manzana verde: crece y reaparece otra
+        eats_green = alive[val_alive == GREEN]
+        if eats_green.size:
+            self.lengths[eats_green] += 1
+            slot = (
+                self.green[eats_green] == new_cell[eats_green, None]
+            ).argmax(axis=1)
+            self.green[eats_green, slot] = self._spawn(eats_green, GREEN)
+            rewards[eats_green] = 10
+
+        # Manzana roja: pierde hasta 2 segmentos de cola
+        eats_red = alive[val_alive == RED]
+        if eats_red.size:
+            for _ in range(2):
+                self._pop_tail(eats_red[self.segments[eats_red] > 1])
+            self.lengths[eats_red] -= 1
+            self._spawn(eats_red, RED)
+            starved = self.lengths[eats_red] <= 0
+            rewards[eats_red] = np.where(starved, -10, -1)
+            dead[eats_red[starved]] = True
+
+        # Casilla vacía: avanza la cola y bonus de proximidad
+        moves = alive[val_alive == EMPTY]
+        if moves.size:
+            self._pop_tail(moves)
+            rewards[moves] = self._proximity_bonus(moves)
+
+        rewards[dead] = -10
+        self.reset(np.flatnonzero(dead))
+        self.done = dead
+        return rewards, dead
+
+    def _pop_tail(self, rows):
+        if rows.size == 0:
+            return
+        base = self._base[rows]
+        tail_ptr = (
+            self.head_ptr[rows] - self.segments[rows] + 1
+        ) % self.num_cells
+        self._grid_flat[base + self._body_flat[base + tail_ptr]] = EMPTY
+        self.segments[rows] -= 1
+
+    def _spawn(self, rows, apple):
+        """
+        Coloca una manzana en una celda libre aleatoria de cada partida.
+        Devuelve las celdas elegidas (-1 si el tablero está lleno).
+        """
+        base = self._base[rows]
+        cells = (self.rng.random(rows.size) * self.num_cells).astype(np.int64)
+        miss = self._grid_flat[base + cells] != EMPTY
+
+        # Muestreo por rechazo: casi siempre acierta a la primera
+        tries = 1
+        while miss.any() and tries < 4:
+            pending = np.flatnonzero(miss)
+            guess = self.rng.integers(0, self.num_cells, size=pending.size)
+            cells[pending] = guess
+            miss[pending] = self._grid_flat[base[pending] + guess] != EMPTY
+            tries += 1
+
+        # Tableros casi llenos: elegir entre las celdas libres exactas
+        if miss.any():
+            pending = np.flatnonzero(miss)
+            scores = self.rng.random((pending.size, self.num_cells))
+            scores[self.grid[rows[pending]] != EMPTY] = -1.0
+            best = scores.argmax(axis=1)
+            has_room = scores[np.arange(pending.size), best] >= 0
+            cells[pending] = np.where(has_room, best, -1)
+
+        placed = cells >= 0
+        self._grid_flat[base[placed] + cells[placed]] = apple
+        return cells
+
+    def _proximity_bonus(self, rows):
+        """Mismo bonus que Board._calcular_bonus_proximidad"""
+        green = self.green[rows]
+        head = self.heads[rows, None]
+        dist = np.abs(self._cell_x[green] - self._cell_x[head]) + np.abs(
+            self._cell_y[green] - self._cell_y[head]
+        )
+        dist[green < 0] = self._no_green
+        return self._bonus[dist.min(axis=1)]
+
+    def get_lengths(self):
+        """Devuelve la longitud actual de cada partida"""
+        return self.lengths